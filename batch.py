@@ -0,0 +1,84 @@
+import numpy as np
+
+from main import *
+
+# Vectorized lookup tables:
+
+TABLES = {}
+
+def getTable(connective_class):
+    """Returns the lookup table of a connective class as an array of codes."""
+    table = TABLES.get(connective_class)
+    if table is None:
+        table = TABLES[connective_class] = np.array(connective_class.Table, dtype = np.int8)
+    return table
+
+def encode(values):
+    """Converts True, False and 'Undefined' values into an array of codes."""
+    return np.vectorize(CODES.__getitem__, otypes = [np.int8])(np.asarray(values, dtype = object))
+
+def decode(codes):
+    """Converts an array of codes back into True, False and 'Undefined'."""
+    return np.asarray(VALUES, dtype = object)[np.asarray(codes)]
+
+# Batch evaluation:
+
+def evaluateBatch(statements, propositions, assignments):
+    """Evaluates a connective graph for every row of a matrix of assignments.
+
+    'assignments' holds one scenario per row and one column of value codes per
+    proposition, in the order given by 'propositions'. Propositions of the
+    graph that are not listed start as 'Undefined'.
+
+    Each row gives the same values as building the statements' graph from
+    scratch with those proposition values: connectives start as True and are
+    evaluated in construction order through their class's lookup table,
+    folded to the right for more than two propositions (see
+    'VariadicConnective'), which may also change the values of their
+    propositions. Folds stop early once every row has the absorbing value.
+
+    Returns the graph's nodes, operands first, and an array with a row per
+    scenario and a column of resulting value codes per node.
+    """
+    assignments = np.asarray(assignments, dtype = np.int8)
+    if assignments.ndim != 2 or assignments.shape[1] != len(propositions):
+        raise ValueError(f'Expected a 2D array with {len(propositions)} columns, got shape {assignments.shape}.')
+
+    nodes = traverse(*statements)
+    columns = {node: index for index, node in enumerate(nodes)}
+    values = np.full((assignments.shape[0], len(nodes)), UNDEFINED, dtype = np.int8)
+    for index, proposition in enumerate(propositions):
+        if proposition in columns:
+            values[:, columns[proposition]] = assignments[:, index]
+
+    for node in nodes:
+        if isinstance(node, Proposition):
+            continue
+        positions = [columns[node]] + [columns[operand] for operand in node.getOperands()]
+        if len(positions) > 3:
+            table = getTable(type(node))
+            absorbing = type(node).Absorbing
+            operands = values[:, positions[1:]].astype(np.intp)
+            last = operands.shape[1] - 1
+            state = operands[:, last]
+            for index in range(last - 1, 0, -1):
+                if absorbing is not None and (state == absorbing).all():
+                    break
+                result = table[(TRUE * 3 + operands[:, index]) * 3 + state]
+                state = result[:, 0].astype(np.intp)
+                operands[:, index] = result[:, 1]
+                if index == last - 1:
+                    operands[:, last] = result[:, 2]
+            result = table[(TRUE * 3 + operands[:, 0]) * 3 + state]
+            operands[:, 0] = result[:, 1]
+            values[:, positions[0]] = result[:, 0]
+            for index, position in enumerate(positions[1:]):
+                values[:, position] = operands[:, index]
+            continue
+        state = np.full(assignments.shape[0], TRUE, dtype = np.intp)
+        for position in positions[1:]:
+            state = state * 3 + values[:, position]
+        result = getTable(type(node))[state]
+        for index, position in enumerate(positions):
+            values[:, position] = result[:, index]
+    return nodes, values
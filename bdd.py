@@ -0,0 +1,286 @@
+from main import *
+
+# Variable ordering heuristics:
+
+def getAppearanceOrder(nodes):
+    """Orders propositions by their appearance in construction order, latest first.
+
+    Operands that are used together end up close to each other, which is the
+    classic depth-first ordering heuristic. Reversing it puts the propositions
+    of each new connective above the graph compiled so far, so that compiling
+    a chain of n connectives takes linear rather than quadratic time.
+    """
+    return [node for node in reversed(nodes) if isinstance(node, Proposition)]
+
+def getFrequencyOrder(nodes):
+    """Orders propositions by decreasing number of connectives using them.
+
+    Ties are broken by the appearance order.
+    """
+    uses = {node: 0 for node in nodes if isinstance(node, Proposition)}
+    for node in nodes:
+        if not isinstance(node, Proposition):
+            for operand in node.getOperands():
+                if operand in uses:
+                    uses[operand] += 1
+    appearance = {proposition: index for index, proposition in enumerate(getAppearanceOrder(nodes))}
+    return sorted(uses, key = lambda proposition: (-uses[proposition], appearance[proposition]))
+
+def getForceOrder(nodes, iterations: int = 20):
+    """Orders propositions with the FORCE heuristic.
+
+    Every node sits on a line, starting in construction order, and each
+    connective forms a net with its operands. On each iteration, nodes move
+    to the mean center of gravity of their nets, which pulls related nodes
+    together. The placement with the smallest total net span is kept, and
+    propositions are ordered by it the way the appearance order is.
+    """
+    nets = [(node,) + tuple(node.getOperands()) for node in nodes if not isinstance(node, Proposition)]
+    memberships = {node: [] for node in nodes}
+    for index, net in enumerate(nets):
+        for node in net:
+            memberships[node].append(index)
+    position = {node: index for index, node in enumerate(nodes)}
+
+    def getSpan():
+        return sum(max(position[node] for node in net) - min(position[node] for node in net) for net in nets)
+
+    best, best_span = dict(position), getSpan()
+    for _ in range(iterations):
+        gravity = [sum(position[node] for node in net) / len(net) for net in nets]
+        target = {
+            node: sum(gravity[index] for index in indices) / len(indices) if indices else position[node]
+            for node, indices in memberships.items()
+        }
+        position = {node: index for index, node in enumerate(sorted(nodes, key = target.__getitem__))}
+        span = getSpan()
+        if span >= best_span:
+            break
+        best, best_span = dict(position), span
+    return sorted(getAppearanceOrder(nodes), key = lambda proposition: -best[proposition])
+
+HEURISTICS = {'appearance': getAppearanceOrder, 'frequency': getFrequencyOrder, 'force': getForceOrder}
+
+# Decision diagram:
+
+class BDD:
+    """Reduced ordered binary decision diagram of connective graphs.
+
+    Diagram nodes are integers: 0 and 1 are the False and True terminals, and
+    any other node tests the proposition at its 'Levels' entry, continuing to
+    its 'Lows' entry if False and its 'Highs' entry if True. The 'Unique'
+    table ensures that no two nodes test the same level with the same
+    children, so every function has a single node and equivalent claims
+    compile to the same one. 'Cache' remembers the results of 'ite', and is
+    dropped whenever it holds more than 'CacheSize' of them to bound memory.
+
+    Connectives compile to the two-valued function their lookup table implies
+    for defined propositions (the same relation 'sat' encodes), so queries
+    never depend on the values currently held by the graph. Propositions are
+    ordered by a heuristic (see 'HEURISTICS') or an explicit sequence, and
+    those met later on are appended to the order.
+    """
+    __slots__ = ('Propositions', 'Order', 'Descriptions', 'Levels', 'Lows', 'Highs', 'Unique', 'Cache', 'CacheSize', 'Nodes')
+
+    def __init__(self, *statements, order = 'appearance', cache_size: int = 1 << 20):
+        nodes = traverse(*statements)
+        if isinstance(order, str):
+            if order not in HEURISTICS:
+                raise ValueError(f"Unknown ordering heuristic '{order}', expected one of {list(HEURISTICS)}.")
+            order = HEURISTICS[order](nodes)
+        self.Propositions = []
+        self.Order = {}
+        self.Descriptions = {}
+        self.Levels = [None, None]
+        self.Lows = [0, 1]
+        self.Highs = [0, 1]
+        self.Unique = {}
+        self.Cache = {}
+        self.CacheSize = cache_size
+        self.Nodes = {}
+        for proposition in order:
+            self.addProposition(proposition)
+        for statement in statements:
+            self.compile(statement)
+
+    def addProposition(self, proposition: Proposition):
+        """Places a proposition after every ordered one and returns its node."""
+        if proposition not in self.Order:
+            self.Order[proposition] = len(self.Propositions)
+            self.Propositions.append(proposition)
+            self.Descriptions.setdefault(proposition.Description, proposition)
+            self.Nodes[proposition] = self.getNode(self.Order[proposition], 0, 1)
+        return self.Nodes[proposition]
+
+    def getNode(self, level: int, low: int, high: int):
+        """Returns the unique node testing a level with the given children."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.Unique.get(key)
+        if node is None:
+            node = self.Unique[key] = len(self.Levels)
+            self.Levels.append(level)
+            self.Lows.append(low)
+            self.Highs.append(high)
+        return node
+
+    def getLevel(self, node: int):
+        """Returns the level a node tests, terminals being below every level."""
+        return len(self.Propositions) if node < 2 else self.Levels[node]
+
+    def ite(self, condition: int, then: int, otherwise: int):
+        """Returns the node of 'if condition then then else otherwise'.
+
+        Cofactors are expanded with an explicit stack, so the depth of the
+        diagram is not limited by recursion.
+        """
+        if len(self.Cache) > self.CacheSize:
+            self.Cache = {}
+        results = []
+        stack = [(condition, then, otherwise, None)]
+        while stack:
+            f, g, h, level = stack.pop()
+            if level is not None:
+                low = results.pop()
+                high = results.pop()
+                result = self.Cache[(f, g, h)] = self.getNode(level, low, high)
+                results.append(result)
+                continue
+            if f == 1 or g == h:
+                results.append(g)
+            elif f == 0:
+                results.append(h)
+            elif g == 1 and h == 0:
+                results.append(f)
+            elif (f, g, h) in self.Cache:
+                results.append(self.Cache[(f, g, h)])
+            else:
+                level = min(self.getLevel(f), self.getLevel(g), self.getLevel(h))
+                stack.append((f, g, h, level))
+                stack.append(tuple(self.Lows[node] if self.getLevel(node) == level else node for node in (f, g, h)) + (None,))
+                stack.append(tuple(self.Highs[node] if self.getLevel(node) == level else node for node in (f, g, h)) + (None,))
+        return results[0]
+
+    def negate(self, node: int):
+        """Returns the node of the negation of a node."""
+        return self.ite(node, 0, 1)
+
+    def apply(self, connective_class, operands):
+        """Returns the node of a connective class's function over operand nodes.
+
+        The function is read from the lookup table and expanded over the
+        operands, variadic connectives being folded from their binary one.
+        """
+        table = connective_class.Table
+        if len(operands) == 1:
+            values = [table[UNDEFINED * 3 + code][0] for code in (FALSE, TRUE)]
+            return self.ite(operands[0], values[TRUE], values[FALSE])
+        result = operands[0]
+        for operand in operands[1:]:
+            values = [[table[(UNDEFINED * 3 + first) * 3 + second][0] for second in (FALSE, TRUE)] for first in (FALSE, TRUE)]
+            branches = [self.ite(operand, values[first][TRUE], values[first][FALSE]) for first in (FALSE, TRUE)]
+            result = self.ite(result, branches[TRUE], branches[FALSE])
+        return result
+
+    def compile(self, statement):
+        """Returns the node of a statement, compiling any new part of its graph.
+
+        Statements compiled before are looked up without traversing them.
+        """
+        node = self.Nodes.get(statement)
+        if node is not None:
+            return node
+        for node in traverse(statement):
+            if node in self.Nodes:
+                continue
+            if isinstance(node, Proposition):
+                self.addProposition(node)
+            else:
+                self.Nodes[node] = self.apply(type(node), [self.Nodes[operand] for operand in node.getOperands()])
+        return self.Nodes[statement]
+
+    def getValues(self, assignment: dict):
+        """Returns the levels assigned by a map of propositions or descriptions to values.
+
+        'Undefined' values, and propositions outside the diagram, are left out.
+        """
+        levels = {}
+        for key, value in assignment.items():
+            proposition = self.Descriptions.get(key) if isinstance(key, str) else key
+            if proposition in self.Order and value != 'Undefined':
+                levels[self.Order[proposition]] = bool(value)
+        return levels
+
+    def restrict(self, statement, assignment: dict):
+        """Returns the node of a statement once the given values are known.
+
+        Runs in time proportional to the size of the statement's diagram.
+        """
+        root = self.compile(statement)
+        levels = self.getValues(assignment)
+        if not levels:
+            return root
+        results = {0: 0, 1: 1}
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node in results:
+                stack.pop()
+                continue
+            level = self.Levels[node]
+            if level in levels:
+                child = self.Highs[node] if levels[level] else self.Lows[node]
+                if child in results:
+                    results[node] = results[child]
+                    stack.pop()
+                else:
+                    stack.append(child)
+                continue
+            low, high = self.Lows[node], self.Highs[node]
+            if low in results and high in results:
+                results[node] = self.getNode(level, results[low], results[high])
+                stack.pop()
+            else:
+                stack.extend(child for child in (low, high) if child not in results)
+        return results[root]
+
+    def evaluate(self, statement, assignment: dict):
+        """Returns the value of a statement under the given values.
+
+        Propositions missing from the assignment are unknown: the statement is
+        True or False if it has that value whatever they are, and 'Undefined'
+        otherwise.
+        """
+        root = self.compile(statement)
+        levels = self.getValues(assignment)
+        node = root
+        while node > 1 and self.Levels[node] in levels:
+            node = self.Highs[node] if levels[self.Levels[node]] else self.Lows[node]
+        if node > 1:
+            node = self.restrict(statement, assignment)
+        return VALUES[node] if node < 2 else VALUES[UNDEFINED]
+
+    def isTautology(self, statement):
+        """Returns whether a statement is True under every assignment."""
+        return self.compile(statement) == 1
+
+    def isContradiction(self, statement):
+        """Returns whether a statement is False under every assignment."""
+        return self.compile(statement) == 0
+
+    def isEquivalent(self, first, second):
+        """Returns whether two statements have the same value under every assignment."""
+        return self.compile(first) == self.compile(second)
+
+    def getSize(self, statement):
+        """Returns the number of diagram nodes of a statement, terminals included."""
+        seen = set()
+        stack = [self.compile(statement)]
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                if node > 1:
+                    stack += (self.Lows[node], self.Highs[node])
+        return len(seen)
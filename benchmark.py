@@ -0,0 +1,230 @@
+import gc
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+from timeit import repeat
+
+from main import *
+from sat import checkConsistency
+
+# Legacy construction:
+
+def legacyConstruct(connective_class, *propositions):
+    """Builds a connective the way it was built before lookup tables existed.
+
+    The relations structure is rebuilt for the new instance by comparing every
+    possible state against the current one, and only the 'True' entry is used.
+    """
+    connective = connective_class.__new__(connective_class)
+    super(connective_class, connective).__init__(*propositions)
+    structure = {
+        (connective.getSelfValue(), connective.getPropValue()) == state: result
+        for state, result in connective_class.Structure.items()
+    }
+    connective.setValues(structure[True])
+    connective.check()
+    return connective
+
+# Legacy comparison:
+
+CLASSES = (Yes, Not, And, Or, XOr, Implicative, BiImplicative)
+
+def throughput(statement, number: int, repetitions: int):
+    """Returns the best constructions per second of the given statement."""
+    return number / min(repeat(statement, number = number, repeat = repetitions))
+
+def run(number: int = 20000, repetitions: int = 5):
+    """Compares legacy and table-based construction throughput per class."""
+    p = Proposition('p')
+    q = Proposition('q')
+    p.setSelfValue(True)
+    q.setSelfValue(True)
+
+    print(f"{'Class'.ljust(16)}{'Legacy (ops/s)'.rjust(18)}{'Table (ops/s)'.rjust(18)}{'Speedup'.rjust(10)}")
+    for connective_class in CLASSES:
+        operands = (p,) if issubclass(connective_class, UnaryConnective) else (p, q)
+        legacy = throughput(lambda: legacyConstruct(connective_class, *operands), number, repetitions)
+        table = throughput(lambda: connective_class(*operands), number, repetitions)
+        print(f"{connective_class.__name__.ljust(16)}{legacy:18,.0f}{table:18,.0f}{table / legacy:9.1f}x")
+
+# Scenarios:
+#
+# Each scenario takes a size, roughly the number of nodes involved, builds its
+# inputs and returns the callable to be timed, so that setup is left out.
+
+def getPropositions(size: int, value = True):
+    """Returns the given number of new propositions with the same value."""
+    propositions = [Proposition(f'p{index}') for index in range(size)]
+    for proposition in propositions:
+        proposition.State = CODES[value]
+    return propositions
+
+def construction(connective_class):
+    """Returns the scenario building 'size' connectives of a class."""
+    def scenario(size: int):
+        p, q = getPropositions(2)
+        operands = (p,) if issubclass(connective_class, UnaryConnective) else (p, q)
+        return lambda: [connective_class(*operands) for _ in range(size)]
+    return scenario
+
+def deep(size: int):
+    """Builds a single chain of 'size' nested connectives of every class."""
+    propositions = getPropositions(size)
+    def build():
+        node = propositions[0]
+        for index in range(1, size):
+            connective_class = CLASSES[index % len(CLASSES)]
+            if issubclass(connective_class, UnaryConnective):
+                node = connective_class(node)
+            else:
+                node = connective_class(node, propositions[index])
+        return node
+    return build
+
+def wide(size: int):
+    """Builds variadic connectives over 'size' propositions each."""
+    propositions = getPropositions(size)
+    return lambda: [connective_class(*propositions) for connective_class in (And, Or, XOr)]
+
+def propagation(size: int):
+    """Propagates a fact along a chain of 'size' implications."""
+    propositions = getPropositions(size, 'Undefined')
+    knowledge_base = KnowledgeBase(*[Implicative(p, q) for p, q in zip(propositions, propositions[1:])])
+    knowledge_base.setFact(propositions[0], True)
+    return knowledge_base.propagate
+
+def getIncoherence(size: int):
+    """Returns copies of the incoherence warning scenario of test 2 totalling 'size' nodes."""
+    statements = []
+    for _ in range(max(size // 7, 1)):
+        p, q, r = getPropositions(3, 'Undefined')
+        statements += [Yes(p), Not(q), Implicative(p, And(q, r))]
+    return statements
+
+def incoherencePropagation(size: int):
+    """Detects the incoherences of a scaled test 2 by propagation."""
+    return KnowledgeBase(*getIncoherence(size)).propagate
+
+def incoherenceConsistency(size: int):
+    """Finds a minimal conflict of a scaled test 2 with the SAT solver."""
+    statements = getIncoherence(size)
+    return lambda: checkConsistency(*statements)
+
+def getExclusion(size: int):
+    """Returns copies of the XOr vs Or scenario of test 4 totalling 'size' nodes."""
+    statements = []
+    for _ in range(max(size // 10, 1)):
+        p, q, r = getPropositions(3, 'Undefined')
+        statements += [Yes(p), Not(q), Yes(r), Or(p, q), XOr(p, q), Or(p, r), XOr(p, r)]
+    return statements
+
+def exclusionPropagation(size: int):
+    """Detects the incoherences of a scaled test 4 by propagation."""
+    return KnowledgeBase(*getExclusion(size)).propagate
+
+def exclusionConsistency(size: int):
+    """Finds a minimal conflict of a scaled test 4 with the SAT solver."""
+    statements = getExclusion(size)
+    return lambda: checkConsistency(*statements)
+
+SCENARIOS = {f'construction.{connective_class.__name__}': construction(connective_class) for connective_class in CLASSES}
+SCENARIOS.update({
+    'graph.deep': deep,
+    'graph.wide': wide,
+    'propagation.chain': propagation,
+    'incoherence.propagation': incoherencePropagation,
+    'incoherence.consistency': incoherenceConsistency,
+    'exclusion.propagation': exclusionPropagation,
+    'exclusion.consistency': exclusionConsistency
+})
+
+SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+
+# Suite:
+
+def measure(scenario, size: int, repetitions: int):
+    """Returns the best time of a scenario, with a fresh setup per repetition.
+
+    Garbage collection is disabled while timing, as 'timeit' does.
+    """
+    best = None
+    for _ in range(repetitions):
+        function = scenario(size)
+        gc.collect()
+        gc.disable()
+        try:
+            start = perf_counter()
+            function()
+            elapsed = perf_counter() - start
+        finally:
+            gc.enable()
+        del function
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def runSuite(names = None, sizes = SIZES, repetitions: int = 3, stream = None):
+    """Times every selected scenario at every size.
+
+    'names' are scenario names or prefixes of them, all scenarios by default.
+    Progress is written to 'stream' when given. Returns the results as a
+    dictionary ready to be stored as JSON.
+    """
+    selected = [name for name in SCENARIOS if not names or any(name == prefix or name.startswith(prefix + '.') for prefix in names)]
+    if not selected:
+        raise ValueError(f'No scenario matches {names}, expected some of {list(SCENARIOS)}.')
+    results = []
+    for name in selected:
+        for size in sizes:
+            seconds = measure(SCENARIOS[name], size, repetitions)
+            results.append({'scenario': name, 'size': size, 'seconds': seconds, 'rate': size / seconds if seconds else None})
+            if stream is not None:
+                stream.write(f"{name.ljust(28)}{size:>10,}{seconds:14.6f} s{size / seconds if seconds else 0:18,.0f} nodes/s\n")
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'repetitions': repetitions, 'results': results}
+
+def compare(current: dict, baseline: dict, threshold: float = 0.2):
+    """Returns the regressions of a suite run against a baseline run.
+
+    A scenario and size present in both has regressed when it takes more than
+    (1 + threshold) times its baseline time. Each regression is given as
+    (scenario, size, baseline seconds, current seconds).
+    """
+    reference = {(result['scenario'], result['size']): result['seconds'] for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        seconds = reference.get((result['scenario'], result['size']))
+        if seconds is not None and result['seconds'] > seconds * (1 + threshold):
+            regressions.append((result['scenario'], result['size'], seconds, result['seconds']))
+    return regressions
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description = 'Logic algorithms benchmark suite.')
+    parser.add_argument('scenarios', nargs = '*', help = f'scenarios or prefixes to run, all by default: {", ".join(SCENARIOS)}')
+    parser.add_argument('-s', '--sizes', type = int, nargs = '+', default = SIZES, help = 'approximate node counts to run each scenario at')
+    parser.add_argument('-r', '--repeat', type = int, default = 3, help = 'timings per scenario and size (best is kept)')
+    parser.add_argument('-o', '--output', help = 'file to store the results in as JSON')
+    parser.add_argument('-b', '--baseline', help = 'JSON results file to compare against')
+    parser.add_argument('-t', '--threshold', type = float, default = 0.2, help = 'relative slowdown counted as a regression')
+    parser.add_argument('--legacy', action = 'store_true', help = 'compare legacy and table-based construction instead')
+    parser.add_argument('-n', '--number', type = int, default = 20000, help = 'constructions per timing of the legacy comparison')
+    arguments = parser.parse_args()
+
+    if arguments.legacy:
+        run(arguments.number, arguments.repeat)
+        sys.exit()
+
+    current = runSuite(arguments.scenarios, arguments.sizes, arguments.repeat, sys.stderr)
+    if arguments.output:
+        with open(arguments.output, 'w', encoding = 'utf-8') as stream:
+            json.dump(current, stream, indent = 4)
+    else:
+        json.dump(current, sys.stdout, indent = 4)
+        sys.stdout.write('\n')
+
+    if arguments.baseline:
+        with open(arguments.baseline, encoding = 'utf-8') as stream:
+            regressions = compare(current, json.load(stream), arguments.threshold)
+        for scenario, size, before, after in regressions:
+            sys.stderr.write(f"Regression: {scenario} at {size:,} nodes took {after:.6f} s, baseline {before:.6f} s ({after / before - 1:+.0%})\n")
+        sys.exit(1 if regressions else 0)
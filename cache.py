@@ -0,0 +1,106 @@
+from collections import OrderedDict
+
+from main import *
+
+# Code-level evaluation:
+
+def simulate(nodes, states: dict):
+    """Returns the value codes that building the given nodes would produce.
+
+    'nodes' must be in construction order (see 'traverse') and 'states' holds
+    the starting code of each proposition. Nothing is written to the nodes.
+    """
+    states = dict(states)
+    for node in nodes:
+        if isinstance(node, Proposition):
+            continue
+        operands = node.getOperands()
+        result = node.transition((TRUE,) + tuple(states[operand] for operand in operands))
+        states[node] = result[0]
+        for operand, code in zip(operands, result[1:]):
+            states[operand] = code
+    return states
+
+# Evaluation cache:
+
+class EvaluationCache:
+    """Remembers the values of formulas under given proposition values.
+
+    A formula is identified by its graph: every node is described by its class
+    and the positions of its operands in 'traverse' order, so shared nodes
+    are told apart from repeated ones, and formulas with the same graph share
+    entries even when they are different objects. Results are keyed by that
+    identity and the codes of the formula's propositions, taken from the
+    given assignment or else from their current values. Changing a
+    value through 'setSelfValue' therefore never returns a stale result: the
+    next query simply has a different key, and entries for values no longer in
+    use are evicted in least recently used order once 'Size' is exceeded.
+    """
+    __slots__ = ('Size', 'Entries', 'Identities', 'Hits', 'Misses', 'Evictions')
+
+    def __init__(self, size: int = 1024):
+        if size < 1:
+            raise ValueError(f'Cache size must be positive, got {size}.')
+        self.Size = size
+        self.Entries = OrderedDict()
+        self.Identities = OrderedDict()
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
+
+    def getIdentity(self, formula):
+        """Returns a formula's graph description, nodes and propositions."""
+        identity = self.Identities.get(formula)
+        if identity is None:
+            nodes = traverse(formula)
+            positions = {node: position for position, node in enumerate(nodes)}
+            graph = tuple(
+                (Proposition,) if isinstance(node, Proposition) else (type(node),) + tuple(positions[operand] for operand in node.getOperands())
+                for node in nodes
+            )
+            identity = self.Identities[formula] = (graph, nodes, [node for node in nodes if isinstance(node, Proposition)])
+            if len(self.Identities) > self.Size:
+                self.Identities.popitem(last = False)
+        else:
+            self.Identities.move_to_end(formula)
+        return identity
+
+    def evaluate(self, formula, assignment: dict = None):
+        """Returns the value the formula takes when built with the given values.
+
+        'assignment' maps propositions, or their descriptions, to values.
+        Propositions missing from it keep their current value.
+        """
+        key, nodes, propositions = self.getIdentity(formula)
+        codes = {}
+        for proposition in propositions:
+            code = proposition.State
+            if assignment:
+                if proposition in assignment:
+                    code = CODES[assignment[proposition]]
+                elif proposition.Description in assignment:
+                    code = CODES[assignment[proposition.Description]]
+            codes[proposition] = code
+        key = (key, tuple(codes.values()))
+
+        value = self.Entries.get(key)
+        if value is not None:
+            self.Hits += 1
+            self.Entries.move_to_end(key)
+            return value
+        self.Misses += 1
+        value = self.Entries[key] = VALUES[simulate(nodes, codes)[formula]]
+        if len(self.Entries) > self.Size:
+            self.Entries.popitem(last = False)
+            self.Evictions += 1
+        return value
+
+    def getStatistics(self):
+        """Returns the cache's hit, miss and eviction counts and its occupancy."""
+        return {'hits': self.Hits, 'misses': self.Misses, 'evictions': self.Evictions, 'entries': len(self.Entries), 'size': self.Size}
+
+    def clear(self):
+        """Drops every entry and resets the statistics."""
+        self.Entries.clear()
+        self.Identities.clear()
+        self.Hits = self.Misses = self.Evictions = 0
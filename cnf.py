@@ -0,0 +1,157 @@
+import shutil
+import sys
+import tempfile
+from argparse import ArgumentParser
+
+from formula import Parser
+from models import ClauseSink, assertStatements
+from main import *
+
+# DIMACS export:
+
+class DIMACSWriter(ClauseSink):
+    """Streams the clauses of an encoding to a DIMACS CNF file.
+
+    Every clause is written as soon as it is added, so the clauses are never
+    held in memory, with its literals as signed variable numbers.
+
+    The problem line comes first but its counts are only known once every
+    clause is written: on seekable streams, a fixed-width line is reserved and
+    filled in by 'close', and on other streams the clauses are spooled to a
+    temporary file which is copied after the problem line.
+    """
+    __slots__ = ('Stream', 'Target', 'Start', 'Written')
+
+    Width = 10
+
+    def __init__(self, stream):
+        super().__init__()
+        self.Target = stream
+        if stream.seekable():
+            self.Stream = stream
+            self.Start = stream.tell()
+            stream.write(self.getProblem(0, 0))
+        else:
+            self.Stream = tempfile.TemporaryFile('w+', encoding = 'ascii')
+            self.Start = None
+        self.Written = 0
+
+    def getProblem(self, variables: int, clauses: int):
+        """Returns the problem line, padded to a fixed width."""
+        return f'p cnf {variables:>{self.Width}} {clauses:>{self.Width}}\n'
+
+    def attach(self, clause):
+        """Writes a clause of distinct variables."""
+        self.Stream.write(' '.join([str(-(literal >> 1) if literal & 1 else literal >> 1) for literal in clause] + ['0\n']))
+        self.Written += 1
+
+    def close(self):
+        """Writes the problem line. The target stream is left open."""
+        if len(str(max(self.Count, self.Written))) > self.Width:
+            raise ValueError(f'Cannot write more than {10 ** self.Width - 1} variables or clauses.')
+        if self.Start is not None:
+            end = self.Stream.tell()
+            self.Stream.seek(self.Start)
+            self.Stream.write(self.getProblem(self.Count, self.Written))
+            self.Stream.seek(end)
+        else:
+            self.Target.write(self.getProblem(self.Count, self.Written))
+            self.Stream.seek(0)
+            shutil.copyfileobj(self.Stream, self.Target)
+            self.Stream.close()
+
+def write(statements, stream, facts: dict = None):
+    """Writes the Tseitin encoding of the statements being True to a stream.
+
+    Every node of the statements' graph gets a single variable, so shared
+    subformulas are defined once and the encoding is linear in the size of
+    the graph (see 'sat.encode'). 'facts' maps propositions to their known
+    values, 'Undefined' ones being left free. Returns the variable of each
+    node.
+    """
+    writer = DIMACSWriter(stream)
+    variables = assertStatements(writer, statements, facts)
+    writer.close()
+    return variables
+
+def dump(statements, path: str, facts: dict = None):
+    """Writes the Tseitin encoding of the statements to a DIMACS CNF file."""
+    with open(path, 'w', encoding = 'ascii') as stream:
+        return write(statements, stream, facts)
+
+# DIMACS model import:
+
+def readModel(lines):
+    """Reads a SAT solver's answer and returns the variable values it sets.
+
+    Both the competition output ('s SATISFIABLE' then 'v' lines of literals)
+    and the MiniSat result file ('SAT' then a line of literals) are read.
+    Returns a dictionary of values by variable number, or None if the answer
+    is 'UNSATISFIABLE'.
+    """
+    model = {}
+    for line in lines:
+        words = line.split()
+        if not words or words[0] == 'c':
+            continue
+        if words[0] == 's':
+            words = words[1:]
+        if words[0] in ('UNSATISFIABLE', 'UNSAT'):
+            return None
+        if words[0] in ('UNKNOWN', 'INDETERMINATE'):
+            raise ValueError('The solver did not decide the problem.')
+        if words[0] in ('SATISFIABLE', 'SAT'):
+            continue
+        if words[0] == 'v':
+            words = words[1:]
+        for word in words:
+            try:
+                literal = int(word)
+            except ValueError:
+                raise ValueError(f"Unexpected '{word}' in a model.") from None
+            if literal:
+                model[abs(literal)] = literal > 0
+    return model
+
+def applyModel(model: dict, variables: dict):
+    """Sets the values of the encoded graph's nodes from a model of their variables.
+
+    Nodes are set in the order 'encode' numbered them, operands first:
+    propositions take their value in the model, and connectives the value
+    their propositions imply (see 'getImpliedState'), so no proposition is
+    changed and every node ends up with the value of the model. Propositions
+    the model leaves unassigned can take any value and are left unchanged.
+    Connectives outside the graph are not updated. Returns whether there was
+    a model.
+    """
+    if model is None:
+        return False
+    for node, variable in variables.items():
+        if not isinstance(node, Proposition):
+            node.State = node.getImpliedState()
+        elif variable in model:
+            node.State = CODES[model[variable]]
+    return True
+
+def load(path: str, variables: dict):
+    """Reads a SAT solver's answer file and sets the propositions' values from it."""
+    with open(path, encoding = 'ascii') as stream:
+        return applyModel(readModel(stream), variables)
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description = 'Writes formulas as DIMACS CNF.')
+    parser.add_argument('input', nargs = '?', default = '-', help = 'file of formulas, one per line (standard input by default)')
+    parser.add_argument('-o', '--output', default = '-', help = 'DIMACS CNF file (standard output by default)')
+    parser.add_argument('-m', '--map', action = 'store_true', help = 'print the variable of each proposition to standard error')
+    arguments = parser.parse_args()
+
+    source = sys.stdin if arguments.input == '-' else open(arguments.input, encoding = 'utf-8')
+    with source:
+        statements = Parser().parseAll(line for line in source if line.strip())
+    target = sys.stdout if arguments.output == '-' else open(arguments.output, 'w', encoding = 'ascii')
+    with target:
+        variables = write(statements, target)
+    if arguments.map:
+        for node, variable in variables.items():
+            if isinstance(node, Proposition):
+                print(f'{variable} {node.Description}', file = sys.stderr)
@@ -0,0 +1,98 @@
+import re
+
+from main import *
+
+# Formula syntax:
+
+UNARY = {cls.Symbol: cls for cls in (Yes, Not)}
+BINARY = {cls.Symbol: cls for cls in (And, Or, XOr, Implicative, BiImplicative)}
+TOKENS = re.compile(r'\[|\]|¬|[^\s\[\]¬]+')
+
+class Parser:
+    """Reads formulas written the way connectives are represented.
+
+    Propositions are written by their description and every connective is
+    enclosed in brackets: '[p]' and '[¬p]' for unary connectives, '[p SYMBOL q]'
+    for binary ones, e.g. '[rains ⟶ [home v cafe]]', and '[p SYMBOL q SYMBOL
+    ...]' for variadic ones.
+
+    Nodes are interned: propositions with the same description and connectives
+    of the same class over the same operands are built once per parser and
+    shared by every formula that contains them. Whole formulas are cached by
+    text as well, so repeated claims are not even tokenized again.
+    """
+    __slots__ = ('Propositions', 'Connectives', 'Formulas', 'Verbose')
+
+    def __init__(self, verbose: bool = False):
+        self.Propositions = {}
+        self.Connectives = {}
+        self.Formulas = {}
+        self.Verbose = verbose
+
+    def getProposition(self, description: str):
+        """Returns the parser's proposition with the given description."""
+        proposition = self.Propositions.get(description)
+        if proposition is None:
+            proposition = self.Propositions[description] = Proposition(description)
+        return proposition
+
+    def getConnective(self, connective_class, *operands):
+        """Returns the parser's connective of the given class over the operands."""
+        key = (connective_class,) + operands
+        connective = self.Connectives.get(key)
+        if connective is None:
+            connective = self.Connectives[key] = connective_class(*operands, verbose = self.Verbose)
+        return connective
+
+    def reduce(self, frame, position: int):
+        """Builds the connective described by the contents of a bracket pair."""
+        if len(frame) == 1 and not isinstance(frame[0], str):
+            return self.getConnective(UNARY[''], frame[0])
+        if len(frame) == 2 and isinstance(frame[0], str) and not isinstance(frame[1], str):
+            return self.getConnective(UNARY[frame[0]], frame[1])
+        if len(frame) >= 3 and len(frame) % 2 == 1:
+            operands = frame[0::2]
+            symbols = set(frame[1::2])
+            if len(symbols) == 1 and not any(isinstance(operand, str) for operand in operands):
+                connective_class = BINARY[symbols.pop()]
+                if len(operands) == 2 or issubclass(connective_class, VariadicConnective):
+                    return self.getConnective(connective_class, *operands)
+        raise ValueError(f"Malformed connective closed at token {position}: {frame}.")
+
+    def parse(self, text: str):
+        """Returns the node described by the given formula."""
+        node = self.Formulas.get(text)
+        if node is not None:
+            return node
+
+        # Brackets open frames holding nodes and symbol strings, which are
+        # reduced into connectives when closed:
+        stack = [[]]
+        for position, token in enumerate(TOKENS.findall(text)):
+            frame = stack[-1]
+            if token == '[':
+                stack.append([])
+            elif token == ']':
+                if len(stack) == 1:
+                    raise ValueError(f"Unbalanced ']' at token {position} of '{text}'.")
+                stack.pop()
+                stack[-1].append(self.reduce(frame, position))
+            elif token in UNARY and not frame:
+                frame.append(token)
+            elif token in BINARY and len(frame) % 2 == 1 and not isinstance(frame[-1], str) and len(stack) > 1:
+                frame.append(token)
+            else:
+                frame.append(self.getProposition(token))
+        if len(stack) != 1 or len(stack[0]) != 1:
+            raise ValueError(f"Expected a single complete formula in '{text}'.")
+
+        node = self.Formulas[text] = stack[0][0]
+        return node
+
+    def parseAll(self, texts):
+        """Returns the nodes described by each of the given formulas."""
+        return [self.parse(text) for text in texts]
+
+def parse(text: str, verbose: bool = False):
+    """Returns the node described by a formula, using a new parser."""
+    return Parser(verbose).parse(text)
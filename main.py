@@ -1,62 +1,616 @@
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count, product
+from time import perf_counter
+from weakref import ref
+
+# Truth value encoding:
+
+FALSE, TRUE, UNDEFINED = 0, 1, 2
+VALUES = (False, True, 'Undefined')
+CODES = {value: code for code, value in enumerate(VALUES)}
+
+def flattenState(state):
+    """Returns a (connective, propositions) value state as a flat tuple."""
+    value, propositions = state
+    return (value,) + (propositions if isinstance(propositions, tuple) else (propositions,))
+
+def encodeState(state):
+    """Returns the table index of a (connective, propositions) value state.
+
+    Every value is mapped to its code in 'CODES' and the resulting digits are
+    read as a base-3 number, the connective's value being the most significant
+    one.
+    """
+    index = 0
+    for value in flattenState(state):
+        index = index * 3 + CODES[value]
+    return index
+
+def buildTable(structure):
+    """Flattens a relations structure into a tuple indexed by encoded state.
+
+    Each entry holds the codes of the resulting state, connective first.
+    """
+    table = [None] * len(structure)
+    for state, result in structure.items():
+        table[encodeState(state)] = tuple(CODES[value] for value in flattenState(result))
+    return tuple(table)
+
+def buildPropagation(table):
+    """Derives the logically implied refinements of a lookup table's states.
+
+    Only the two-valued meaning of a connective is read from the table, in
+    the rows in which it is 'Undefined' and its propositions are not. For
+    every state, the resulting entry holds the state with each 'Undefined'
+    value replaced by the value all consistent completions of the state agree
+    on, if they do, whatever the table's own row sets, or None if the state
+    has no consistent completion at all.
+    """
+    arity = 0
+    while 3 ** (arity + 1) < len(table):
+        arity += 1
+    digits = lambda index: tuple(index // 3 ** position % 3 for position in range(arity, -1, -1))
+    implied = lambda codes: table[encodeState((VALUES[UNDEFINED], tuple(VALUES[code] for code in codes)))][0]
+    propagation = []
+    for index in range(len(table)):
+        state = digits(index)
+        completions = [
+            completion for completion in product(*[(FALSE, TRUE) if code == UNDEFINED else (code,) for code in state])
+            if implied(completion[1:]) == completion[0]
+        ]
+        if not completions:
+            propagation.append(None)
+            continue
+        agreed = [set(values) for values in zip(*completions)]
+        propagation.append(tuple(
+            agreed[position].pop() if code == UNDEFINED and len(agreed[position]) == 1 else code
+            for position, code in enumerate(state)
+        ))
+    return tuple(propagation)
+
+# Dependents:
+
+class DependentList(list):
+    """Connectives depending on a node, held through weak references.
+
+    Connectives are only kept alive by whatever uses them, so a discarded
+    connective is dropped instead of being kept and re-evaluated forever.
+    Iterating yields the live connectives in registration order. References
+    to dead ones are purged once the list outgrows 'Limit', which is then
+    set to twice the live size, so the list stays within twice the number
+    of live connectives at a constant amortized cost.
+    """
+    __slots__ = ('Limit',)
+
+    def __init__(self):
+        self.Limit = 8
+
+    def __iter__(self):
+        for reference in list.__iter__(self):
+            connective = reference()
+            if connective is not None:
+                yield connective
+
+    def add(self, connective):
+        """Registers a connective."""
+        self.append(ref(connective))
+        if len(self) > self.Limit:
+            self.purge()
+
+    def purge(self):
+        """Drops the references to dead connectives."""
+        self[:] = [reference for reference in list.__iter__(self) if reference() is not None]
+        self.Limit = max(8, 2 * len(self))
+
 class Proposition:
-    """Contains basic data for propositions."""
-    def __init__(self, description: str):
-        self.Description = description
-        self.Value = 'Undefined'
+    """Contains basic data for propositions.
+
+    The value is stored as its code in 'State'. 'Value' and the getter and
+    setter methods translate it back into True, False or 'Undefined'.
+
+    'Dependents' lists the connectives built on top of the proposition, which
+    are re-evaluated whenever its value is changed through 'setSelfValue'
+    (see 'DependentList').
+
+    This class only defines behavior and holds no data: building a
+    'Proposition' returns a 'PlainProposition', which keeps its description,
+    value and dependents in its own slots, while 'StoredProposition' handles
+    keep them in a 'PropositionStore'.
+    """
+    __slots__ = ()
+
+    Level = 0
+
+    def __new__(cls, *arguments):
+        return object.__new__(PlainProposition if cls is Proposition else cls)
 
     def __repr__(self):
         return f'{self.Description}'
 
+    @property
+    def Value(self):
+        return VALUES[self.State]
+
+    @Value.setter
+    def Value(self, value):
+        self.setSelfValue(value)
+
     def setSelfValue(self, value):
-        """Sets the object's value."""
-        self.Value = value
+        """Sets the object's value and updates its dependent connectives."""
+        code = CODES[value]
+        if code != self.State:
+            self.State = code
+            reevaluate(self)
 
     def getSelfValue(self):
         """Returns the object's value."""
-        return self.Value
+        return VALUES[self.State]
+
+class PlainProposition(Proposition):
+    """Proposition holding its own data."""
+    __slots__ = ('Description', 'State', 'Dependents')
+
+    def __init__(self, description: str):
+        self.Description = description
+        self.State = UNDEFINED
+        self.Dependents = DependentList()
+
+class PropositionStore:
+    """Keeps the values of many propositions in a single contiguous buffer.
+
+    Propositions created by the store are thin handles holding an index into
+    'States', a bytearray of value codes, so that large sets of propositions
+    do not require a value attribute per object. A single handle is built per
+    proposition, on the first request, and kept in 'Handles'.
+    """
+    __slots__ = ('Descriptions', 'States', 'Dependents', 'Handles')
+
+    def __init__(self):
+        self.Descriptions = []
+        self.States = bytearray()
+        self.Dependents = {}
+        self.Handles = []
+
+    def __len__(self):
+        return len(self.States)
+
+    def newProposition(self, description: str):
+        """Appends a new 'Undefined' proposition and returns its handle."""
+        self.Descriptions.append(description)
+        self.States.append(UNDEFINED)
+        self.Handles.append(None)
+        return self.getProposition(len(self.States) - 1)
+
+    def getProposition(self, index: int):
+        """Returns the handle to the proposition stored at the given index."""
+        handle = self.Handles[index]
+        if handle is None:
+            handle = self.Handles[index] = StoredProposition(self, index)
+        return handle
+
+    def getValues(self):
+        """Returns the values of all stored propositions."""
+        return [VALUES[code] for code in self.States]
+
+class StoredProposition(Proposition):
+    """Proposition whose data lives inside of a 'PropositionStore'.
+
+    Handles only hold their store and index. Handles to the same stored
+    proposition are interchangeable, and therefore compare and hash equal.
+    """
+    __slots__ = ('Store', 'Index')
+
+    def __init__(self, store: PropositionStore, index: int):
+        self.Store = store
+        self.Index = index
+
+    def __eq__(self, other):
+        return isinstance(other, StoredProposition) and self.Store is other.Store and self.Index == other.Index
+
+    def __hash__(self):
+        return hash((id(self.Store), self.Index))
 
-# Main connective class:
+    @property
+    def Description(self):
+        return self.Store.Descriptions[self.Index]
+
+    @property
+    def Dependents(self):
+        dependents = self.Store.Dependents.get(self.Index)
+        if dependents is None:
+            dependents = self.Store.Dependents[self.Index] = DependentList()
+        return dependents
+
+    @property
+    def State(self):
+        return self.Store.States[self.Index]
+
+    @State.setter
+    def State(self, code):
+        self.Store.States[self.Index] = code
+
+def traverse(*statements):
+    """Returns every node reachable from the given statements, operands first.
+
+    Shared nodes are listed once, in the order in which they would have to be
+    constructed.
+    """
+    nodes = []
+    seen = set()
+    stack = [(statement, False) for statement in reversed(statements)]
+    while stack:
+        node, expanded = stack.pop()
+        if node in seen:
+            continue
+        if expanded or isinstance(node, Proposition):
+            seen.add(node)
+            nodes.append(node)
+            continue
+        stack.append((node, True))
+        for operand in reversed(node.getOperands()):
+            if operand not in seen:
+                stack.append((operand, False))
+    return nodes
+
+def reevaluate(node):
+    """Updates the connectives that depend on the given node's value.
+
+    Each affected connective is evaluated once, from True through its lookup
+    table (see 'transition') with its operands' current values, and it may
+    also set the values of its propositions. Only the affected cone of the
+    graph is visited: connectives are processed in order of 'Level', and the
+    dependents of every node whose value changed are queued.
+
+    This matches building the graph again only while no connective sets the
+    value of a proposition that an already evaluated one read, since that one
+    is not evaluated again: after 'XOr(b, XOr(a, b))' and setting 'a' to
+    False, 'b' stays False, while building it with 'a' False sets 'b' to True.
+    """
+    heap = []
+    queued = set()
+    counter = count()
+    for dependent in node.Dependents:
+        if dependent not in queued:
+            queued.add(dependent)
+            heappush(heap, (dependent.Level, next(counter), dependent))
+    profiler = PROFILER
+    while heap:
+        connective = heappop(heap)[2]
+        if profiler is not None:
+            profiler.recordEvaluation(connective)
+        nodes = (connective,) + tuple(connective.getOperands())
+        states = connective.transition((TRUE,) + tuple(operand.State for operand in nodes[1:]))
+        for changed, state in zip(nodes, states):
+            if state != changed.State:
+                changed.State = state
+                for dependent in changed.Dependents:
+                    if dependent not in queued:
+                        queued.add(dependent)
+                        heappush(heap, (dependent.Level, next(counter), dependent))
+
+def assign(values: dict):
+    """Sets the values of many propositions at once and keeps them as given.
+
+    Unlike 'setSelfValue', the connectives depending on them are not built
+    again: they only take the value their propositions imply (see
+    'getImpliedState'), in order of 'Level', so no proposition is changed.
+    This shows a model of the graph, such as a solver's, as it is.
+    """
+    heap = []
+    queued = set()
+    counter = count()
+    for proposition, value in values.items():
+        proposition.State = CODES[value]
+        for dependent in proposition.Dependents:
+            if dependent not in queued:
+                queued.add(dependent)
+                heappush(heap, (dependent.Level, next(counter), dependent))
+    while heap:
+        connective = heappop(heap)[2]
+        state = connective.getImpliedState()
+        if state != connective.State:
+            connective.State = state
+            for dependent in connective.Dependents:
+                if dependent not in queued:
+                    queued.add(dependent)
+                    heappush(heap, (dependent.Level, next(counter), dependent))
+
+# Diagnostics:
+
+class Diagnostics:
+    """Collects undefined values warnings as structured records.
+
+    Each record is a (connective, states) pair, 'states' holding the value
+    codes of the connective and its propositions when the warning was raised,
+    and 'Counts' keeps the number of warnings per connective class.
+
+    Without a stream, records are kept in 'Records' to be queried afterwards.
+    With one, they are buffered and written to it in batches of 'BatchSize'
+    (and on 'flush'), and then dropped.
+    """
+    __slots__ = ('Records', 'Counts', 'Stream', 'BatchSize')
+
+    def __init__(self, stream = None, batch_size: int = 1000):
+        self.Records = []
+        self.Counts = {}
+        self.Stream = stream
+        self.BatchSize = batch_size
+
+    def record(self, connective, states):
+        """Stores a warning for the given connective."""
+        self.Records.append((connective, states))
+        name = type(connective).__name__
+        self.Counts[name] = self.Counts.get(name, 0) + 1
+        if self.Stream is not None and len(self.Records) >= self.BatchSize:
+            self.flush()
+
+    def getUndefined(self, record):
+        """Returns the propositions that were undefined in a record."""
+        connective, states = record
+        return [operand for operand, state in zip(connective.getOperands(), states[1:]) if state == UNDEFINED]
+
+    def getTotal(self):
+        """Returns the number of warnings recorded so far."""
+        return sum(self.Counts.values())
+
+    def flush(self):
+        """Writes the buffered warnings to the stream, if any, and drops them."""
+        if self.Stream is None:
+            return
+        self.Stream.write(''.join(connective.getWarning(states) + '\n' for connective, states in self.Records))
+        self.Records = []
+
+    def clear(self):
+        """Drops every record and count."""
+        self.Records = []
+        self.Counts = {}
+
+DIAGNOSTICS = None
+
+def setDiagnostics(sink):
+    """Makes the given sink (or None) receive warnings. Returns the previous one."""
+    global DIAGNOSTICS
+    previous, DIAGNOSTICS = DIAGNOSTICS, sink
+    return previous
+
+def getDiagnostics():
+    """Returns the active diagnostics sink, if any."""
+    return DIAGNOSTICS
+
+# Profiling:
+
+class Profiler:
+    """Counts the work done by connectives, per connective class.
+
+    'Constructions' counts built connectives and 'Time' their cumulative
+    construction time. 'Evaluations' counts how many times their values were
+    evaluated: through their lookup table on construction, for their implied
+    value on re-evaluation or for their refinement on propagation. 'Rows'
+    counts the lookup table rows that fired and 'Undefined' the undefined
+    values reported by 'check'.
+
+    Profiling is opt-in (see 'setProfiler'): without an active profiler, each
+    hook costs a single global lookup.
+    """
+    __slots__ = ('Constructions', 'Evaluations', 'Rows', 'Time', 'Undefined', 'Started')
+
+    def __init__(self):
+        self.Constructions = {}
+        self.Evaluations = {}
+        self.Rows = {}
+        self.Time = {}
+        self.Undefined = {}
+        self.Started = None
+
+    def startConstruction(self):
+        """Starts timing a construction, which 'check' ends."""
+        self.Started = perf_counter()
+
+    def recordEvaluation(self, connective, row = None):
+        """Counts an evaluation and, if given, the lookup table row that fired.
+
+        'row' is either a lookup table index or a label.
+        """
+        connective_class = type(connective)
+        self.Evaluations[connective_class] = self.Evaluations.get(connective_class, 0) + 1
+        if row is not None:
+            key = (connective_class, row)
+            self.Rows[key] = self.Rows.get(key, 0) + 1
+
+    def recordCheck(self, connective, states):
+        """Counts the undefined values of a check, ending a pending construction."""
+        connective_class = type(connective)
+        if self.Started is not None:
+            self.Time[connective_class] = self.Time.get(connective_class, 0.0) + perf_counter() - self.Started
+            self.Constructions[connective_class] = self.Constructions.get(connective_class, 0) + 1
+            self.Started = None
+        undefined = states.count(UNDEFINED)
+        if undefined:
+            self.Undefined[connective_class] = self.Undefined.get(connective_class, 0) + undefined
+
+    def getLabel(self, connective_class, row):
+        """Returns the label of a lookup table row: its case name, else its state."""
+        if isinstance(row, str):
+            return row
+        for state in connective_class.Structure:
+            if encodeState(state) == row:
+                return connective_class.Cases.get(state, str(state))
+        return str(row)
+
+    def snapshot(self):
+        """Returns the counters gathered so far, by connective class name."""
+        classes = set(self.Constructions) | set(self.Evaluations) | set(self.Undefined)
+        result = {}
+        for connective_class in sorted(classes, key = lambda connective_class: connective_class.__name__):
+            rows = {}
+            for (row_class, row), number in self.Rows.items():
+                if row_class is connective_class:
+                    label = self.getLabel(connective_class, row)
+                    rows[label] = rows.get(label, 0) + number
+            result[connective_class.__name__] = {
+                'constructions': self.Constructions.get(connective_class, 0),
+                'evaluations': self.Evaluations.get(connective_class, 0),
+                'time': self.Time.get(connective_class, 0.0),
+                'undefined': self.Undefined.get(connective_class, 0),
+                'rows': rows
+            }
+        return result
+
+    def clear(self):
+        """Resets every counter."""
+        self.Constructions = {}
+        self.Evaluations = {}
+        self.Rows = {}
+        self.Time = {}
+        self.Undefined = {}
+        self.Started = None
+
+PROFILER = None
+
+def setProfiler(profiler):
+    """Makes the given profiler (or None) gather counters. Returns the previous one."""
+    global PROFILER
+    previous, PROFILER = PROFILER, profiler
+    return previous
+
+def getProfiler():
+    """Returns the active profiler, if any."""
+    return PROFILER
+
+# Main connective class:
 
 class Connective:
     """Defines standard operational behavior for all connectives.
 
     The structure of each class matches the following pattern:
 
-        1. Proposition and verbose definition.
-        2. Symbol definition.
-        3. Relations structure definition and evaluation.
+        1. Symbol definition.
+        2. Relations structure definition and its lookup table.
+        3. Proposition and verbose definition, followed by the evaluation.
+
+    Relations structures are shared by all instances of a class: they map each
+    possible (connective, propositions) value state to the resulting one and
+    are flattened into 'Table', which is indexed by the encoded state (see
+    'encodeState') and holds the codes of the resulting values. 'Propagation'
+    is indexed the same way and holds the logically implied refinements (see
+    'buildPropagation'). 'Cases' names the special rows of the structure,
+    which label them when profiling (see 'Profiler').
 
     Connectives' values must be 'True' by default due to the fact that they are
     used to define propositions' values, and therefore require a boolean
     evaluation instead of an 'Undefined' statement.
+
+    Every connective registers itself in its propositions' 'Dependents',
+    without keeping itself alive, and is one 'Level' above the highest of
+    them, which is used to re-evaluate dependent connectives in order when a
+    value changes (see 'reevaluate').
     """
+    __slots__ = ('State', 'Verbose', 'Dependents', 'Level', '__weakref__')
+
+    Symbol = ''
+    Structure = {}
+    Table = ()
+    Propagation = ()
+    Cases = {}
+
     def __init__(self, verbose: bool = False):
-        self.Symbol = ''
-        self.Value = True
+        if PROFILER is not None:
+            PROFILER.startConstruction()
+        self.State = TRUE
         self.Verbose = verbose
+        self.Dependents = DependentList()
+
+    @property
+    def Value(self):
+        return VALUES[self.State]
+
+    @Value.setter
+    def Value(self, value):
+        self.setSelfValue(value)
 
     def setSelfValue(self, value):
-        """Sets the object's value."""
-        self.Value = value
+        """Sets the object's value and updates its dependent connectives."""
+        code = CODES[value]
+        if code != self.State:
+            self.State = code
+            reevaluate(self)
 
     def getSelfValue(self):
         """Returns the object's value."""
-        return self.Value
+        return VALUES[self.State]
 
-# Main connective class subdivisions:
+    def check(self):
+        """Reports 'Undefined' values inside of the connective.
+
+        Warnings are recorded by the active diagnostics sink (see
+        'setDiagnostics'). Without one, they are only printed for verbose
+        connectives, and nothing else is done. The active profiler, if any,
+        counts them too.
+        """
+        sink = DIAGNOSTICS
+        if sink is None and not self.Verbose and PROFILER is None:
+            return
+        states = (self.State,) + tuple(operand.State for operand in self.getOperands())
+        if PROFILER is not None:
+            PROFILER.recordCheck(self, states)
+        if UNDEFINED in states and (sink is not None or self.Verbose):
+            if sink is None:
+                print(self.getWarning(states))
+            else:
+                sink.record(self, states)
+
+    def getStates(self):
+        """Returns the value codes of the object and its propositions."""
+        return (self.State,) + tuple(operand.State for operand in self.getOperands())
+
+    def transition(self, states):
+        """Returns the value codes construction would set from the given ones."""
+        index = 0
+        for code in states:
+            index = index * 3 + code
+        return self.Table[index]
+
+    def refinement(self, states):
+        """Returns the logically implied refinement of the given value codes.
+
+        None is returned when they have no consistent completion.
+        """
+        index = 0
+        for code in states:
+            index = index * 3 + code
+        return self.Propagation[index]
+
+    def register(self):
+        """Adds the object to its propositions' dependents and sets its level."""
+        level = 0
+        reference = ref(self)
+        for operand in self.getOperands():
+            dependents = operand.Dependents
+            dependents.append(reference)
+            if len(dependents) > dependents.Limit:
+                dependents.purge()
+            if operand.Level > level:
+                level = operand.Level
+        self.Level = level + 1
+
+# Main connective class subdivisions:
 
 class UnaryConnective(Connective):
     """Defines specific behavior for single proposition connectives."""
+    __slots__ = ('Proposition',)
+
     def __init__(self, proposition, verbose: bool = False):
         super().__init__(verbose)
         self.Proposition = proposition
+        self.register()
         
     def __repr__(self):
         return f'[{self.Symbol}{self.Proposition}]'
 
     def setPropValue(self, value):
-        """Sets the object's proposition value."""
-        self.Proposition.setSelfValue(value)
+        """Sets the object's proposition value without re-evaluating others."""
+        self.Proposition.State = CODES[value]
 
     def setValues(self, values):
         """Call for both value setters of the given object."""
@@ -67,24 +621,43 @@ class UnaryConnective(Connective):
         """Returns the object's proposition value."""
         return self.Proposition.getSelfValue()
 
-    def check(self):
-        """Checks for 'Undefined' values inside of the connective."""
-        if 'Undefined' in [self.getSelfValue(), self.getPropValue()]:
-            print(f"[Logic] Warning: '{self.__repr__()}' with value {self.getSelfValue()} and propositions ('{self.Proposition}', {self.getPropValue()}) has undefined values.")
+    def getOperands(self):
+        """Returns the object's proposition as a single element tuple."""
+        return (self.Proposition,)
+
+    def getImpliedState(self):
+        """Returns the value code the proposition alone implies for the object."""
+        return self.Table[UNDEFINED * 3 + self.Proposition.State][0]
+
+    def evaluate(self):
+        """Sets the values given by the lookup table for the current state."""
+        index = self.State * 3 + self.Proposition.State
+        if PROFILER is not None:
+            PROFILER.recordEvaluation(self, index)
+        state = self.Table[index]
+        self.State = state[0]
+        self.Proposition.State = state[1]
+
+    def getWarning(self, states):
+        """Returns the undefined values warning for the given value codes."""
+        return f"[Logic] Warning: '{self.__repr__()}' with value {VALUES[states[0]]} and propositions ('{self.Proposition}', {VALUES[states[1]]}) has undefined values."
 
 class BinaryConnective(Connective):
     """Defines specific behavior for double proposition connectives."""
+    __slots__ = ('Propositions',)
+
     def __init__(self, proposition_1: Proposition, proposition_2: Proposition, verbose: bool = False):
         super().__init__(verbose)
         self.Propositions = (proposition_1, proposition_2)
+        self.register()
 
     def __repr__(self):
-        return f'[{self.Propositions[0]} {self.Symbol} {self.Propositions[1]}]'
+        return '[' + f' {self.Symbol} '.join(str(proposition) for proposition in self.Propositions) + ']'
 
     def setPropValue(self, values):
-        """Sets the object's propositions' values."""
+        """Sets the object's propositions' values without re-evaluating others."""
         for index in range(len(self.Propositions)):
-            self.Propositions[index].setSelfValue(values[index])
+            self.Propositions[index].State = CODES[values[index]]
 
     def setValues(self, values):
         """Call for both value setters of the given object."""
@@ -93,15 +666,123 @@ class BinaryConnective(Connective):
 
     def getPropValue(self):
         """Returns the object's propositions' values."""
-        return (self.Propositions[0].getSelfValue(), self.Propositions[1].getSelfValue())
-
-    def check(self):
-        """Checks for 'Undefined' values inside of the connective."""
-        if 'Undefined' == self.getSelfValue() or 'Undefined' in self.getPropValue():
-            undefined = []
-            for index in range(len(self.getPropValue())):
-                undefined.append(self.Propositions[index]) if self.getPropValue()[index] == 'Undefined' else None
-            print(f"Warning: '{self.__repr__()}' ({self.getSelfValue()}) has undefined values in proposition(s): {undefined[0] if len(undefined) == 1 else str(tuple(undefined))[1:-1]}.")
+        return tuple(proposition.getSelfValue() for proposition in self.Propositions)
+
+    def getOperands(self):
+        """Returns the object's propositions."""
+        return self.Propositions
+
+    def getImpliedState(self):
+        """Returns the value code the propositions alone imply for the object."""
+        first, second = self.Propositions
+        return self.Table[(UNDEFINED * 3 + first.State) * 3 + second.State][0]
+
+    def evaluate(self):
+        """Sets the values given by the lookup table for the current state."""
+        first, second = self.Propositions
+        index = (self.State * 3 + first.State) * 3 + second.State
+        if PROFILER is not None:
+            PROFILER.recordEvaluation(self, index)
+        state = self.Table[index]
+        self.State = state[0]
+        first.State = state[1]
+        second.State = state[2]
+
+    def getWarning(self, states):
+        """Returns the undefined values warning for the given value codes."""
+        undefined = [proposition for proposition, state in zip(self.Propositions, states[1:]) if state == UNDEFINED]
+        return f"Warning: '{self.__repr__()}' ({VALUES[states[0]]}) has undefined values in proposition(s): {undefined[0] if len(undefined) == 1 else str(tuple(undefined))[1:-1]}."
+
+class VariadicConnective(BinaryConnective):
+    """Defines specific behavior for connectives of two or more propositions.
+
+    With two propositions, the connective behaves exactly like any binary one
+    and uses its lookup table. With more, construction folds the lookup table
+    to the right, so that 'And(a, b, c)' gives 'a', 'b' and 'c' the values
+    'And(a, And(b, c))' would, without building the inner connectives: each
+    of them starts as True and only its resulting value is passed on. Once
+    that value is the class's 'Absorbing' one, which a True connective keeps
+    whatever its other proposition and without changing it, the inner steps
+    left are skipped and only the outermost one is taken.
+
+    Logical propagation (see 'refinement') and the implied value do not depend
+    on how the propositions are grouped, and are resolved in a single pass by
+    two methods each subclass defines:
+
+        1. 'getImplication' returns the value implied by the propositions.
+        2. 'refine' returns the propositions' values implied by a defined
+           connective value, or None if they contradict it.
+    """
+    __slots__ = ()
+
+    Absorbing = None
+
+    def __init__(self, *propositions, verbose: bool = False):
+        # A trailing boolean is 'verbose' passed positionally, as binary
+        # connectives take it:
+        if propositions and isinstance(propositions[-1], bool):
+            propositions, verbose = propositions[:-1], propositions[-1]
+        if len(propositions) < 2:
+            raise ValueError(f'{type(self).__name__} requires at least two propositions, got {len(propositions)}.')
+        for proposition in propositions:
+            if not isinstance(proposition, (Proposition, Connective)):
+                raise TypeError(f'{type(self).__name__} operands must be propositions or connectives, got {proposition!r}.')
+        Connective.__init__(self, verbose)
+        self.Propositions = propositions
+        self.register()
+
+    def getImpliedState(self):
+        """Returns the value code the propositions alone imply for the object."""
+        if len(self.Propositions) == 2:
+            return super().getImpliedState()
+        return self.getImplication([proposition.State for proposition in self.Propositions])
+
+    def transition(self, states):
+        """Returns the value codes construction would set from the given ones."""
+        if len(states) == 3:
+            return super().transition(states)
+        table = self.Table
+        absorbing = self.Absorbing
+        codes = list(states[1:])
+        last = len(codes) - 1
+        state = codes[last]
+        position = last - 1
+        while position > 0 and state != absorbing:
+            result = table[(TRUE * 3 + codes[position]) * 3 + state]
+            state = result[0]
+            codes[position] = result[1]
+            if position == last - 1:
+                codes[last] = result[2]
+            position -= 1
+        result = table[(states[0] * 3 + codes[0]) * 3 + state]
+        codes[0] = result[1]
+        return (result[0],) + tuple(codes)
+
+    def refinement(self, states):
+        """Returns the logically implied refinement of the given value codes.
+
+        None is returned when they have no consistent completion.
+        """
+        if len(states) == 3:
+            return super().refinement(states)
+        implied = self.getImplication(states[1:])
+        if states[0] == UNDEFINED:
+            return (implied,) + tuple(states[1:])
+        if implied != UNDEFINED:
+            return None if implied != states[0] else tuple(states)
+        codes = self.refine(states[0], states[1:])
+        return None if codes is None else (states[0],) + codes
+
+    def evaluate(self):
+        """Sets the values construction gives for the current state."""
+        if len(self.Propositions) == 2:
+            return super().evaluate()
+        if PROFILER is not None:
+            PROFILER.recordEvaluation(self, 'Variadic')
+        states = self.transition(self.getStates())
+        self.State = states[0]
+        for proposition, code in zip(self.Propositions, states[1:]):
+            proposition.State = code
 
 # Unary connectives:
 
@@ -112,31 +793,41 @@ class Yes(UnaryConnective):
 
     This connective is required as inverse of the 'Not' one.
     """
-    def __init__(self, proposition, verbose: bool = False):
-        super().__init__(proposition, verbose)
+    __slots__ = ()
+
+    Structure = {
 
-        self.Structure = {
+        # Connective value definition:
 
-            # Connective value definition:
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, True):                 (True, True),
-            (self.getSelfValue(), self.getPropValue()) == (True, False):                (True, False),
-            (self.getSelfValue(), self.getPropValue()) == (True, 'Undefined'):          (True, True),   # Class-Specific Case 1
+        (True, True):                (True, True),
+        (True, False):               (True, False),
+        (True, 'Undefined'):         (True, True),                # Class-Specific Case 1
 
-            # Proposition value definition:
+        # Proposition value definition:
 
-            (self.getSelfValue(), self.getPropValue()) == (False, True):                (False, False),
-            (self.getSelfValue(), self.getPropValue()) == (False, False):               (False, True),
-            (self.getSelfValue(), self.getPropValue()) == (False, 'Undefined'):         (False, False), # Class-Specific Case 2
+        (False, True):               (False, False),
+        (False, False):              (False, True),
+        (False, 'Undefined'):        (False, False),              # Class-Specific Case 2
 
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', True):          (True, True),   # Special Case 1
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', False):         (False, False), # Special Case 2
+        ('Undefined', True):         (True, True),                # Special Case 1
+        ('Undefined', False):        (False, False),              # Special Case 2
 
-            # Standard 'else'
+        # Standard 'else'
 
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', 'Undefined'):   ('Undefined', 'Undefined')
-        }
-        self.setValues(self.Structure[True])
+        ('Undefined', 'Undefined'):  ('Undefined', 'Undefined')
+    }
+    Table = buildTable(Structure)
+    Propagation = buildPropagation(Table)
+    Cases = {
+        (True, 'Undefined'):         'Class-Specific Case 1',
+        (False, 'Undefined'):        'Class-Specific Case 2',
+        ('Undefined', True):         'Special Case 1',
+        ('Undefined', False):        'Special Case 2'
+    }
+
+    def __init__(self, proposition, verbose: bool = False):
+        super().__init__(proposition, verbose)
+        self.evaluate()
         self.check()
 
 class Not(UnaryConnective):
@@ -144,253 +835,360 @@ class Not(UnaryConnective):
 
     If True, inverts the value of the passed proposition, else keeps it.
     """
-    def __init__(self, proposition, verbose: bool = False):
-        super().__init__(proposition, verbose)
-        self.Symbol = '¬'
+    __slots__ = ()
+
+    Symbol = '¬'
+
+    Structure = {
 
-        self.Structure = {
+        # Connective value definition:
 
-            # Connective value definition:
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, True):                 (True, False),
-            (self.getSelfValue(), self.getPropValue()) == (True, False):                (True, True),
-            (self.getSelfValue(), self.getPropValue()) == (True, 'Undefined'):          (True, False),  # Class-Specific Case 1
+        (True, True):                (True, False),
+        (True, False):               (True, True),
+        (True, 'Undefined'):         (True, False),               # Class-Specific Case 1
 
-            # Proposition value definition:
+        # Proposition value definition:
 
-            (self.getSelfValue(), self.getPropValue()) == (False, True):                (False, True),
-            (self.getSelfValue(), self.getPropValue()) == (False, False):               (False, False),
-            (self.getSelfValue(), self.getPropValue()) == (False, 'Undefined'):         (False, True),  # Class-Specific Case 2
+        (False, True):               (False, True),
+        (False, False):              (False, False),
+        (False, 'Undefined'):        (False, True),               # Class-Specific Case 2
 
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', True):          (False, True),  # Special Case 1
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', False):         (True, False),  # Special Case 2
+        ('Undefined', True):         (False, True),               # Special Case 1
+        ('Undefined', False):        (True, False),               # Special Case 2
 
-            # Standard 'else'
-            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', 'Undefined'):   ('Undefined', 'Undefined')
-        }
-        self.setValues(self.Structure[True])
+        # Standard 'else'
+
+        ('Undefined', 'Undefined'):  ('Undefined', 'Undefined')
+    }
+    Table = buildTable(Structure)
+    Propagation = buildPropagation(Table)
+    Cases = {
+        (True, 'Undefined'):         'Class-Specific Case 1',
+        (False, 'Undefined'):        'Class-Specific Case 2',
+        ('Undefined', True):         'Special Case 1',
+        ('Undefined', False):        'Special Case 2'
+    }
+
+    def __init__(self, proposition, verbose: bool = False):
+        super().__init__(proposition, verbose)
+        self.evaluate()
         self.check()
         
 # Binary connectives:
 
-class And(BinaryConnective):
-    """And binary connective.
+class And(VariadicConnective):
+    """And connective.
 
-    Combines two elements and returns True if both of them are True.
+    Combines two or more elements and returns True if all of them are True.
     """
-    def __init__(self, proposition_1, proposition_2, verbose: bool = False):
-        super().__init__(proposition_1, proposition_2, verbose)
-        self.Propositions = (proposition_1, proposition_2)
-        self.Symbol = '^'
-
-        self.Structure = {
-
-            # Connective value definition:
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, True)):                         (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, False)):                        (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, True)):                        (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, False)):                       (False, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, True)):                        (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, False)):                       (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, True)):                       (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, False)):                      (False, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, True)):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, False)):                 (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, True)):                 (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, False)):                (False, (False, False)),
-
-            # Proposition value definition:
-
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, 'Undefined')):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, 'Undefined')):                 (False, (False, 'Undefined')),          # Special Case 1
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', True)):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', False)):                 (False, ('Undefined', False)),          # Special Case 2
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, 'Undefined')):                 (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, 'Undefined')):                (False, (False, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', True)):                 (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', False)):                (False, (False, False)),
-            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, 'Undefined')):           ('Undefined', (True, 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, 'Undefined')):          (False, (False, 'Undefined')),          # Special Case 3
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', True)):           ('Undefined', ('Undefined', True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', False)):          (False, ('Undefined', False)),          # Special Case 4
-
-            # Standard 'else':
-
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', 'Undefined')):           (True, ('Undefined', 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', 'Undefined')):          (False, ('Undefined', 'Undefined')),            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', 'Undefined')):    ('Undefined', ('Undefined', 'Undefined'))
-        }
-        self.setValues(self.Structure[True])
+    __slots__ = ()
+
+    Symbol = '^'
+    Absorbing = FALSE
+
+    Structure = {
+
+        # Connective value definition:
+
+        (True, (True, True)):                       (True, (True, True)),
+        (True, (True, False)):                      (False, (True, False)),
+        (True, (False, True)):                      (False, (False, True)),
+        (True, (False, False)):                     (False, (False, False)),
+
+        (False, (True, True)):                      (True, (True, True)),
+        (False, (True, False)):                     (False, (True, False)),
+        (False, (False, True)):                     (False, (False, True)),
+        (False, (False, False)):                    (False, (False, False)),
+
+        ('Undefined', (True, True)):                (True, (True, True)),
+        ('Undefined', (True, False)):               (False, (True, False)),
+        ('Undefined', (False, True)):               (False, (False, True)),
+        ('Undefined', (False, False)):              (False, (False, False)),
+
+        # Proposition value definition:
+
+        (True, (True, 'Undefined')):                (True, (True, True)),
+        (True, (False, 'Undefined')):               (False, (False, 'Undefined')),              # Special Case 1
+        (True, ('Undefined', True)):                (True, (True, True)),
+        (True, ('Undefined', False)):               (False, ('Undefined', False)),              # Special Case 2
+
+        (False, (True, 'Undefined')):               (False, (True, False)),
+        (False, (False, 'Undefined')):              (False, (False, False)),
+        (False, ('Undefined', True)):               (False, (False, True)),
+        (False, ('Undefined', False)):              (False, (False, False)),
+
+        ('Undefined', (True, 'Undefined')):         ('Undefined', (True, 'Undefined')),
+        ('Undefined', (False, 'Undefined')):        (False, (False, 'Undefined')),              # Special Case 3
+        ('Undefined', ('Undefined', True)):         ('Undefined', ('Undefined', True)),
+        ('Undefined', ('Undefined', False)):        (False, ('Undefined', False)),              # Special Case 4
+
+        # Standard 'else':
+
+        (True, ('Undefined', 'Undefined')):         (True, ('Undefined', 'Undefined')),
+        (False, ('Undefined', 'Undefined')):        (False, ('Undefined', 'Undefined')),
+        ('Undefined', ('Undefined', 'Undefined')):  ('Undefined', ('Undefined', 'Undefined'))
+    }
+    Table = buildTable(Structure)
+    Propagation = buildPropagation(Table)
+    Cases = {
+        (True, (False, 'Undefined')):         'Special Case 1',
+        (True, ('Undefined', False)):         'Special Case 2',
+        ('Undefined', (False, 'Undefined')):  'Special Case 3',
+        ('Undefined', ('Undefined', False)):  'Special Case 4'
+    }
+
+    def __init__(self, *propositions, verbose: bool = False):
+        super().__init__(*propositions, verbose = verbose)
+        self.evaluate()
         self.check()
 
-class Or(BinaryConnective):
-    """Or binary connective.
-
-    Combines two elements and returns True if at least one of them is True.
+    def getImplication(self, codes):
+        """Returns False on the first False proposition, else True if all are True."""
+        implied = TRUE
+        for code in codes:
+            if code == FALSE:
+                return FALSE
+            if code == UNDEFINED:
+                implied = UNDEFINED
+        return implied
+
+    def refine(self, state: int, codes):
+        """Sets every proposition if True, or the only undefined one if False."""
+        if state == TRUE:
+            return None if FALSE in codes else (TRUE,) * len(codes)
+        if codes.count(UNDEFINED) == 1 and FALSE not in codes:
+            return tuple(FALSE if code == UNDEFINED else code for code in codes)
+        return tuple(codes)
+
+class Or(VariadicConnective):
+    """Or connective.
+
+    Combines two or more elements and returns True if at least one of them is
+    True.
     """
-    def __init__(self, proposition_1, proposition_2, verbose = False):
-        super().__init__(proposition_1, proposition_2, verbose)
-        self.Symbol = 'v'
-
-        self.Structure = {
-
-            # Connective value definition:
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, True)):                         (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, False)):                        (True, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, True)):                        (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, False)):                       (False, (False, False)),
-            
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, True)):                        (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, False)):                       (True, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, True)):                       (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, False)):                      (False, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, True)):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, False)):                 (True, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, True)):                 (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, False)):                (False, (False, False)),
-
-            # Proposition value definition:
-
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, 'Undefined')):                  (True, (True, 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, 'Undefined')):                 (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', True)):                  (True, ('Undefined', True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', False)):                 (True, (True, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, 'Undefined')):                 (True, (True, 'Undefined')),            # Special Case 1
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, 'Undefined')):                (False, (False, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', True)):                 (True, ('Undefined', True)),            # Special Case 2
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', False)):                (False, ('Undefined', False)),
-            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', True)):           (True, ('Undefined', True)),            # Special Case 3
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', False)):          ('Undefined', ('Undefined', False)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, 'Undefined')):           (True, (True, 'Undefined')),            # Special Case 4
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, 'Undefined')):          ('Undefined', (False, 'Undefined')),
-
-            # Standard 'else':
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', 'Undefined')):           (True, ('Undefined', 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', 'Undefined')):          (False, ('Undefined', 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', 'Undefined')):    ('Undefined', ('Undefined', 'Undefined'))
-        }
-        self.setValues(self.Structure[True])
+    __slots__ = ()
+
+    Symbol = 'v'
+    Absorbing = TRUE
+
+    Structure = {
+
+        # Connective value definition:
+
+        (True, (True, True)):                       (True, (True, True)),
+        (True, (True, False)):                      (True, (True, False)),
+        (True, (False, True)):                      (True, (False, True)),
+        (True, (False, False)):                     (False, (False, False)),
+
+        (False, (True, True)):                      (True, (True, True)),
+        (False, (True, False)):                     (True, (True, False)),
+        (False, (False, True)):                     (True, (False, True)),
+        (False, (False, False)):                    (False, (False, False)),
+
+        ('Undefined', (True, True)):                (True, (True, True)),
+        ('Undefined', (True, False)):               (True, (True, False)),
+        ('Undefined', (False, True)):               (True, (False, True)),
+        ('Undefined', (False, False)):              (False, (False, False)),
+
+        # Proposition value definition:
+
+        (True, (True, 'Undefined')):                (True, (True, 'Undefined')),
+        (True, (False, 'Undefined')):               (True, (False, True)),
+        (True, ('Undefined', True)):                (True, ('Undefined', True)),
+        (True, ('Undefined', False)):               (True, (True, False)),
+
+        (False, (True, 'Undefined')):               (True, (True, 'Undefined')),                # Special Case 1
+        (False, (False, 'Undefined')):              (False, (False, False)),
+        (False, ('Undefined', True)):               (True, ('Undefined', True)),                # Special Case 2
+        (False, ('Undefined', False)):              (False, ('Undefined', False)),
+
+        ('Undefined', ('Undefined', True)):         (True, ('Undefined', True)),                # Special Case 3
+        ('Undefined', ('Undefined', False)):        ('Undefined', ('Undefined', False)),
+        ('Undefined', (True, 'Undefined')):         (True, (True, 'Undefined')),                # Special Case 4
+        ('Undefined', (False, 'Undefined')):        ('Undefined', (False, 'Undefined')),
+
+        # Standard 'else':
+
+        (True, ('Undefined', 'Undefined')):         (True, ('Undefined', 'Undefined')),
+        (False, ('Undefined', 'Undefined')):        (False, ('Undefined', 'Undefined')),
+        ('Undefined', ('Undefined', 'Undefined')):  ('Undefined', ('Undefined', 'Undefined'))
+    }
+    Table = buildTable(Structure)
+    Propagation = buildPropagation(Table)
+    Cases = {
+        (False, (True, 'Undefined')):         'Special Case 1',
+        (False, ('Undefined', True)):         'Special Case 2',
+        ('Undefined', ('Undefined', True)):   'Special Case 3',
+        ('Undefined', (True, 'Undefined')):   'Special Case 4'
+    }
+
+    def __init__(self, *propositions, verbose: bool = False):
+        super().__init__(*propositions, verbose = verbose)
+        self.evaluate()
         self.check()
 
-class XOr(BinaryConnective):
-    """XOr binary connective.
-
-    Combines two elements and returns True if only one of them is True.
+    def getImplication(self, codes):
+        """Returns True on the first True proposition, else False if all are False."""
+        implied = FALSE
+        for code in codes:
+            if code == TRUE:
+                return TRUE
+            if code == UNDEFINED:
+                implied = UNDEFINED
+        return implied
+
+    def refine(self, state: int, codes):
+        """Sets every proposition if False, or the only undefined one if True."""
+        if state == FALSE:
+            return None if TRUE in codes else (FALSE,) * len(codes)
+        if codes.count(UNDEFINED) == 1 and TRUE not in codes:
+            return tuple(TRUE if code == UNDEFINED else code for code in codes)
+        return tuple(codes)
+
+class XOr(VariadicConnective):
+    """XOr connective.
+
+    Combines two elements and returns True if only one of them is True. With
+    more elements, returns True if an odd number of them are True.
     """
-    def __init__(self, proposition_1, proposition_2, verbose = False):
-        super().__init__(proposition_1, proposition_2, verbose)
-        self.Symbol = 'xv'
-
-        self.Structure = {
-
-            # Connective value definition:
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, True)):                         (False, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, False)):                        (True, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, True)):                        (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, False)):                       (False, (False, False)),
-            
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, True)):                        (False, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, False)):                       (True, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, True)):                       (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, False)):                      (False, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, True)):                  (False, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, False)):                 (True, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, True)):                 (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, False)):                (False, (False, False)),
-
-            # Proposition value definition:
-
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, 'Undefined')):                  (True, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, 'Undefined')):                 (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', True)):                  (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', False)):                 (True, (True, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, 'Undefined')):                 (False, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, 'Undefined')):                (False, (False, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', True)):                 (False, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', False)):                (False, (False, False)),
-            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', True)):           ('Undefined', ('Undefined', True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', False)):          ('Undefined', ('Undefined', False)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, 'Undefined')):           ('Undefined', (True, 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, 'Undefined')):          ('Undefined', (False, 'Undefined')),
-
-            # Standard 'else':
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', 'Undefined')):           (True, ('Undefined', 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', 'Undefined')):          (False, ('Undefined', 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', 'Undefined')):    ('Undefined', ('Undefined', 'Undefined'))
-        }
-        self.setValues(self.Structure[True])
+    __slots__ = ()
+
+    Symbol = 'xv'
+
+    Structure = {
+
+        # Connective value definition:
+
+        (True, (True, True)):                       (False, (True, True)),
+        (True, (True, False)):                      (True, (True, False)),
+        (True, (False, True)):                      (True, (False, True)),
+        (True, (False, False)):                     (False, (False, False)),
+
+        (False, (True, True)):                      (False, (True, True)),
+        (False, (True, False)):                     (True, (True, False)),
+        (False, (False, True)):                     (True, (False, True)),
+        (False, (False, False)):                    (False, (False, False)),
+
+        ('Undefined', (True, True)):                (False, (True, True)),
+        ('Undefined', (True, False)):               (True, (True, False)),
+        ('Undefined', (False, True)):               (True, (False, True)),
+        ('Undefined', (False, False)):              (False, (False, False)),
+
+        # Proposition value definition:
+
+        (True, (True, 'Undefined')):                (True, (True, False)),
+        (True, (False, 'Undefined')):               (True, (False, True)),
+        (True, ('Undefined', True)):                (True, (False, True)),
+        (True, ('Undefined', False)):               (True, (True, False)),
+
+        (False, (True, 'Undefined')):               (False, (True, True)),
+        (False, (False, 'Undefined')):              (False, (False, False)),
+        (False, ('Undefined', True)):               (False, (True, True)),
+        (False, ('Undefined', False)):              (False, (False, False)),
+
+        ('Undefined', ('Undefined', True)):         ('Undefined', ('Undefined', True)),
+        ('Undefined', ('Undefined', False)):        ('Undefined', ('Undefined', False)),
+        ('Undefined', (True, 'Undefined')):         ('Undefined', (True, 'Undefined')),
+        ('Undefined', (False, 'Undefined')):        ('Undefined', (False, 'Undefined')),
+
+        # Standard 'else':
+
+        (True, ('Undefined', 'Undefined')):         (True, ('Undefined', 'Undefined')),
+        (False, ('Undefined', 'Undefined')):        (False, ('Undefined', 'Undefined')),
+        ('Undefined', ('Undefined', 'Undefined')):  ('Undefined', ('Undefined', 'Undefined'))
+    }
+    Table = buildTable(Structure)
+    Propagation = buildPropagation(Table)
+
+    def __init__(self, *propositions, verbose: bool = False):
+        super().__init__(*propositions, verbose = verbose)
+        self.evaluate()
         self.check()
 
+    def getImplication(self, codes):
+        """Returns the parity of the propositions, stopping at the first undefined one."""
+        parity = FALSE
+        for code in codes:
+            if code == UNDEFINED:
+                return UNDEFINED
+            parity ^= code
+        return parity
+
+    def refine(self, state: int, codes):
+        """Sets the only undefined proposition, if any, to match the parity."""
+        if codes.count(UNDEFINED) != 1:
+            return tuple(codes)
+        parity = state
+        for code in codes:
+            if code != UNDEFINED:
+                parity ^= code
+        return tuple(parity if code == UNDEFINED else code for code in codes)
+
 class Implicative(BinaryConnective):
     """Implicative binary connective.
 
     Combines two elements and returns True unless the first one is True and the
     second one is False.
     """
+    __slots__ = ()
+
+    Symbol = '⟶'
+
+    Structure = {
+
+        # Connective value definition:
+
+        (True, (True, True)):                       (True, (True, True)),
+        (True, (True, False)):                      (False, (True, False)),
+        (True, (False, True)):                      (True, (False, True)),
+        (True, (False, False)):                     (True, (False, False)),
+
+        (False, (True, True)):                      (True, (True, True)),
+        (False, (True, False)):                     (False, (True, False)),
+        (False, (False, True)):                     (True, (False, True)),
+        (False, (False, False)):                    (True, (False, False)),
+
+        ('Undefined', (True, True)):                (True, (True, True)),
+        ('Undefined', (True, False)):               (False, (True, False)),
+        ('Undefined', (False, True)):               (True, (False, True)),
+        ('Undefined', (False, False)):              (True, (False, False)),
+
+        # Proposition value definition:
+
+        (True, (True, 'Undefined')):                (True, (True, True)),
+        (True, (False, 'Undefined')):               (True, (False, 'Undefined')),
+        (True, ('Undefined', True)):                (True, (True, True)),
+        (True, ('Undefined', False)):               ('Undefined', ('Undefined', False)),        # Special Case 1
+
+        (False, (True, 'Undefined')):               (False, (True, False)),
+        (False, (False, 'Undefined')):              (True, (False, 'Undefined')),               # Special Case 2
+        (False, ('Undefined', True)):               (True, ('Undefined', True)),                # Special Case 3
+        (False, ('Undefined', False)):              (False, (True, False)),
+
+        ('Undefined', (True, 'Undefined')):         ('Undefined', (True, 'Undefined')),
+        ('Undefined', (False, 'Undefined')):        (True, (False, 'Undefined')),               # Special Case 4
+        ('Undefined', ('Undefined', True)):         ('Undefined', ('Undefined', True)),
+        ('Undefined', ('Undefined', False)):        (False, ('Undefined', False)),              # Special Case 5
+
+        # Standard 'else':
+
+        (True, ('Undefined', 'Undefined')):         (True, ('Undefined', 'Undefined')),
+        (False, ('Undefined', 'Undefined')):        (False, ('Undefined', 'Undefined')),
+        ('Undefined', ('Undefined', 'Undefined')):  ('Undefined', ('Undefined', 'Undefined'))
+    }
+    Table = buildTable(Structure)
+    Propagation = buildPropagation(Table)
+    Cases = {
+        (True, ('Undefined', False)):         'Special Case 1',
+        (False, (False, 'Undefined')):        'Special Case 2',
+        (False, ('Undefined', True)):         'Special Case 3',
+        ('Undefined', (False, 'Undefined')):  'Special Case 4',
+        ('Undefined', ('Undefined', False)):  'Special Case 5'
+    }
+
     def __init__(self, proposition_1, proposition_2, verbose = False):
         super().__init__(proposition_1, proposition_2, verbose)
-        self.Propositions = (proposition_1, proposition_2)
-        self.Symbol = '⟶'
-
-        self.Structure = {
-
-            # Connective value definition:
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, True)):                         (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, False)):                        (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, True)):                        (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, False)):                       (True, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, True)):                        (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, False)):                       (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, True)):                       (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, False)):                      (True, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, True)):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, False)):                 (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, True)):                 (True, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, False)):                (True, (False, False)),
-
-            # Proposition value definition:
-
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, 'Undefined')):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, 'Undefined')):                 (True, (False, 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', True)):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', False)):                 ('Undefined', ('Undefined', False)),    # Special Case 1
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, 'Undefined')):                 (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, 'Undefined')):                (True, (False, 'Undefined')),           # Special Case 2
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', True)):                 (True, ('Undefined', True)),            # Special Case 3
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', False)):                (False, (True, False)),
-            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, 'Undefined')):           ('Undefined', (True, 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, 'Undefined')):          (True, (False, 'Undefined')),           # Special Case 4
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', True)):           ('Undefined', ('Undefined', True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', False)):          (False, ('Undefined', False)),          # Special Case 5
-
-            # Standard 'else':
-
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', 'Undefined')):           (True, ('Undefined', 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', 'Undefined')):          (False, ('Undefined', 'Undefined')),            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', 'Undefined')):    ('Undefined', ('Undefined', 'Undefined'))
-        }
-        self.setValues(self.Structure[True])
+        self.evaluate()
         self.check()
 
 class BiImplicative(BinaryConnective):
@@ -399,51 +1197,210 @@ class BiImplicative(BinaryConnective):
     Combines two elements and returns True only if both elements have the same
     value (either True or False).
     """
+    __slots__ = ()
+
+    Symbol = '⟷'
+
+    Structure = {
+
+        # Connective value definition:
+
+        (True, (True, True)):                       (True, (True, True)),
+        (True, (True, False)):                      (False, (True, False)),
+        (True, (False, True)):                      (False, (False, True)),
+        (True, (False, False)):                     (True, (False, False)),
+
+        (False, (True, True)):                      (True, (True, True)),
+        (False, (True, False)):                     (False, (True, False)),
+        (False, (False, True)):                     (False, (False, True)),
+        (False, (False, False)):                    (True, (False, False)),
+
+        ('Undefined', (True, True)):                (True, (True, True)),
+        ('Undefined', (True, False)):               (False, (True, False)),
+        ('Undefined', (False, True)):               (False, (False, True)),
+        ('Undefined', (False, False)):              (True, (False, False)),
+
+        # Proposition value definition:
+
+        (True, (True, 'Undefined')):                (True, (True, True)),
+        (True, (False, 'Undefined')):               (True, (False, False)),
+        (True, ('Undefined', True)):                (True, (True, True)),
+        (True, ('Undefined', False)):               (True, (False, False)),
+
+        (False, (True, 'Undefined')):               (False, (True, False)),
+        (False, (False, 'Undefined')):              (False, (False, True)),
+        (False, ('Undefined', True)):               (False, (False, True)),
+        (False, ('Undefined', False)):              (False, (True, False)),
+
+        ('Undefined', (True, 'Undefined')):         ('Undefined', (True, 'Undefined')),
+        ('Undefined', (False, 'Undefined')):        ('Undefined', (False, 'Undefined')),
+        ('Undefined', ('Undefined', True)):         ('Undefined', ('Undefined', True)),
+        ('Undefined', ('Undefined', False)):        ('Undefined', ('Undefined', False)),
+
+        # Standard 'else':
+
+        (True, ('Undefined', 'Undefined')):         (True, ('Undefined', 'Undefined')),
+        (False, ('Undefined', 'Undefined')):        (False, ('Undefined', 'Undefined')),
+        ('Undefined', ('Undefined', 'Undefined')):  ('Undefined', ('Undefined', 'Undefined'))
+    }
+    Table = buildTable(Structure)
+    Propagation = buildPropagation(Table)
+
     def __init__(self, proposition_1, proposition_2, verbose = False):
         super().__init__(proposition_1, proposition_2, verbose)
-        self.Symbol = '⟷'
-
-        self.Structure = {
-
-            # Connective value definition:
-            
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, True)):                         (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, False)):                        (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, True)):                        (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, False)):                       (True, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, True)):                        (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, False)):                       (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, True)):                       (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, False)):                      (True, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, True)):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, False)):                 (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, True)):                 (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, False)):                (True, (False, False)),
-
-            # Proposition value definition:
-
-            (self.getSelfValue(), self.getPropValue()) == (True, (True, 'Undefined')):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, (False, 'Undefined')):                 (True, (False, False)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', True)):                  (True, (True, True)),
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', False)):                 (True, (False, False)),
-
-            (self.getSelfValue(), self.getPropValue()) == (False, (True, 'Undefined')):                 (False, (True, False)),
-            (self.getSelfValue(), self.getPropValue()) == (False, (False, 'Undefined')):                (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', True)):                 (False, (False, True)),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', False)):                (False, (True, False)),
-            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (True, 'Undefined')):           ('Undefined', (True, 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', (False, 'Undefined')):          ('Undefined', (False, 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', True)):           ('Undefined', ('Undefined', True)),
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', False)):          ('Undefined', ('Undefined', False)),
-
-            # Standard 'else':
-
-            (self.getSelfValue(), self.getPropValue()) == (True, ('Undefined', 'Undefined')):           (True, ('Undefined', 'Undefined')),
-            (self.getSelfValue(), self.getPropValue()) == (False, ('Undefined', 'Undefined')):          (False, ('Undefined', 'Undefined')),            
-            (self.getSelfValue(), self.getPropValue()) == ('Undefined', ('Undefined', 'Undefined')):    ('Undefined', ('Undefined', 'Undefined'))
-        }
-        self.setValues(self.Structure[True])
+        self.evaluate()
         self.check()
+
+# Knowledge base:
+
+class KnowledgeBase:
+    """Registers statements and propagates their values to a fixpoint.
+
+    Statements are asserted connectives, and are therefore True. Connectives
+    nested inside of them start as 'Undefined', as do propositions without a
+    fact set through 'setFact'. Only registered connectives take part in the
+    propagation, even if other ones depend on the same propositions.
+
+    Propagation uses each class's 'Propagation' table, which is derived from
+    the two-valued meaning of the construction one, so every value implied
+    by a connective and its known values is deduced. It only refines
+    'Undefined' values: a connective whose state has no consistent
+    completion is recorded in 'Conflicts' instead of having its values
+    overwritten. Since every value can be refined at most once, the fixpoint
+    is reached after a number of steps linear in the number of refinements,
+    and it does not depend on the order in which statements were built or
+    added.
+
+    Hypotheses are explored on top of a propagation with 'assume' and undone
+    with 'retract'. While one is open, every value change is recorded in
+    'Trail' as a (node, previous value code) pair, and 'Levels' keeps the
+    trail and conflicts lengths at which each hypothesis started, so nested
+    hypotheses are undone one at a time, in time proportional to the changes
+    they caused rather than to the size of the graph.
+    """
+    __slots__ = ('Statements', 'Connectives', 'Propositions', 'Facts', 'Nodes', 'Conflicts', 'Trail', 'Levels')
+
+    def __init__(self, *statements):
+        self.Statements = []
+        self.Connectives = []
+        self.Propositions = []
+        self.Facts = {}
+        self.Nodes = set()
+        self.Conflicts = []
+        self.Trail = []
+        self.Levels = []
+        self.add(*statements)
+
+    def add(self, *statements):
+        """Registers the given statements and every node nested inside them."""
+        self.Statements.extend(statements)
+        for node in traverse(*statements):
+            if node in self.Nodes:
+                continue
+            self.Nodes.add(node)
+            if isinstance(node, Proposition):
+                self.Propositions.append(node)
+            else:
+                self.Connectives.append(node)
+
+    def setFact(self, proposition: Proposition, value):
+        """Sets the value a proposition takes before every propagation."""
+        if proposition not in self.Nodes:
+            self.Nodes.add(proposition)
+            self.Propositions.append(proposition)
+        self.Facts[proposition] = CODES[value]
+
+    def reset(self):
+        """Restores facts and assertions, leaving everything else 'Undefined'.
+
+        Open hypotheses are dropped.
+        """
+        for proposition in self.Propositions:
+            proposition.State = self.Facts.get(proposition, UNDEFINED)
+        for connective in self.Connectives:
+            connective.State = UNDEFINED
+        for statement in self.Statements:
+            statement.State = TRUE
+        self.Conflicts = []
+        self.Trail = []
+        self.Levels = []
+
+    def refine(self, connectives):
+        """Propagates values from the given connectives to a fixpoint.
+
+        Changes are recorded in 'Trail' while a hypothesis is open.
+        """
+        queue = deque(connectives)
+        queued = set(queue)
+        found = set(self.Conflicts)
+        trail = self.Trail if self.Levels else None
+        profiler = PROFILER
+        while queue:
+            connective = queue.popleft()
+            queued.discard(connective)
+            if profiler is not None:
+                profiler.recordEvaluation(connective)
+            result = connective.refinement(connective.getStates())
+            if result is None:
+                if connective not in found:
+                    found.add(connective)
+                    self.Conflicts.append(connective)
+                continue
+            for node, code in zip((connective,) + connective.getOperands(), result):
+                if code != node.State:
+                    if trail is not None:
+                        trail.append((node, node.State))
+                    node.State = code
+                    affected = node.Dependents if isinstance(node, Proposition) else [node, *node.Dependents]
+                    for dependent in affected:
+                        if dependent in self.Nodes and dependent not in queued:
+                            queued.add(dependent)
+                            queue.append(dependent)
+
+    def propagate(self):
+        """Propagates values from facts and statements to a fixpoint.
+
+        Returns whether the knowledge base is coherent, which is to say that no
+        conflicts were found.
+        """
+        self.reset()
+        self.refine(self.Connectives)
+        return not self.Conflicts
+
+    def assume(self, node, value):
+        """Opens a hypothesis giving a node a value, and propagates it.
+
+        Only the connectives affected by the change are visited. A node that
+        already has another defined value contradicts the hypothesis, and is
+        itself recorded in 'Conflicts'. Returns whether the knowledge base is
+        still coherent.
+        """
+        if node not in self.Nodes:
+            raise ValueError(f"Cannot assume a value for '{node}', which is not part of the knowledge base.")
+        code = CODES[value]
+        self.Levels.append((len(self.Trail), len(self.Conflicts)))
+        if code == UNDEFINED or code == node.State:
+            return not self.Conflicts
+        if node.State != UNDEFINED:
+            self.Conflicts.append(node)
+            return False
+        self.Trail.append((node, node.State))
+        node.State = code
+        affected = node.Dependents if isinstance(node, Proposition) else [node, *node.Dependents]
+        self.refine(dependent for dependent in affected if dependent in self.Nodes)
+        return not self.Conflicts
+
+    def retract(self):
+        """Undoes the latest open hypothesis and everything it implied."""
+        if not self.Levels:
+            raise ValueError('There is no hypothesis to retract.')
+        length, conflicts = self.Levels.pop()
+        trail = self.Trail
+        while len(trail) > length:
+            node, code = trail.pop()
+            node.State = code
+        del self.Conflicts[conflicts:]
+
+    def isCoherent(self):
+        """Returns whether the last propagation found no conflicts."""
+        return not self.Conflicts
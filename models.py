@@ -0,0 +1,293 @@
+from sat import Solver, encode
+from main import *
+
+# Clause collection:
+
+class ClauseSink:
+    """Receives the clauses of an encoding instead of solving them.
+
+    Offers the part of the 'Solver' interface 'encode' relies on, so the
+    same definitions can be handed to other algorithms. Literals are encoded
+    the way the solver does, and subclasses define what 'attach' does with
+    each clause.
+    """
+    __slots__ = ('Count', 'Unsatisfiable')
+
+    def __init__(self):
+        self.Count = 0
+        self.Unsatisfiable = False
+
+    def newVariable(self):
+        """Adds a variable and returns its number."""
+        return self.newVariables(1)[0]
+
+    def newVariables(self, count: int):
+        """Adds the given number of variables and returns the range of their numbers."""
+        first = self.Count + 1
+        self.Count += count
+        return range(first, first + count)
+
+    def addClause(self, literals):
+        """Adds a clause, dropping repeated literals and tautologies."""
+        clause = sorted(set(literals))
+        if any(literal ^ 1 in clause for literal in clause):
+            return True
+        if not clause:
+            self.Unsatisfiable = True
+        self.attach(clause)
+        return not self.Unsatisfiable
+
+class Clauses(ClauseSink):
+    """Collects the clauses of an encoding in 'Clauses'."""
+    __slots__ = ('Clauses',)
+
+    def __init__(self):
+        super().__init__()
+        self.Clauses = []
+
+    def attach(self, clause):
+        """Adds a clause of distinct variables."""
+        self.Clauses.append(tuple(clause))
+
+def assertStatements(sink: ClauseSink, statements, facts: dict = None):
+    """Encodes the statements being True into a clause sink and returns the variable of each node.
+
+    'facts' maps propositions to their known values, 'Undefined' ones being
+    left free.
+    """
+    variables = encode(sink, statements)
+    for statement in statements:
+        sink.addClause([2 * variables[statement]])
+    for proposition, value in (facts or {}).items():
+        if proposition not in variables:
+            raise ValueError(f"Fact on '{proposition}', which is not part of the statements.")
+        if value != 'Undefined':
+            sink.addClause([2 * variables[proposition] + (not value)])
+    return variables
+
+def getClauses(statements, facts: dict = None):
+    """Returns the clauses of the statements being True and the variable of each node (see 'assertStatements')."""
+    clauses = Clauses()
+    return clauses, assertStatements(clauses, statements, facts)
+
+# Model counting:
+
+def simplify(clauses, literals):
+    """Sets the given literals and propagates unit clauses.
+
+    Returns the remaining clauses, without their false literals, and the set
+    literals, or None when a clause becomes empty.
+    """
+    occurrences = {}
+    for index, clause in enumerate(clauses):
+        for element in clause:
+            occurrences.setdefault(element, []).append(index)
+    assigned = set(literals)
+    queue = list(assigned)
+    while queue:
+        current = queue.pop()
+        if current ^ 1 in assigned:
+            return None
+        for index in occurrences.get(current ^ 1, ()):
+            remaining = None
+            for element in clauses[index]:
+                if element in assigned:
+                    break
+                if element ^ 1 not in assigned:
+                    if remaining is not None:
+                        break
+                    remaining = element
+            else:
+                if remaining is None:
+                    return None
+                assigned.add(remaining)
+                queue.append(remaining)
+    reduced = []
+    for clause in clauses:
+        if not any(element in assigned for element in clause):
+            reduced.append(tuple(element for element in clause if element ^ 1 not in assigned))
+    return reduced, assigned
+
+def preprocess(clauses):
+    """Propagates unit clauses and merges equivalent variables.
+
+    Two variables are equivalent, or opposite, when a pair of binary clauses
+    says so, as the definitions of 'Yes' and 'Not' connectives do. Each group
+    is replaced by a single variable, which does not change the number of
+    models since the others are determined by it.
+
+    Returns the remaining clauses and the variables they no longer mention
+    because they are determined, or None when the clauses are unsatisfiable.
+    """
+    determined = set()
+    while True:
+        if any(not clause for clause in clauses):
+            return None
+        units = [clause[0] for clause in clauses if len(clause) == 1]
+        if units:
+            result = simplify(clauses, units)
+            if result is None:
+                return None
+            clauses, assigned = result
+            determined.update(literal >> 1 for literal in assigned)
+
+        # Each variable is kept as its root's value XOr a parity:
+        parents = {}
+        def find(variable):
+            parity = 0
+            while variable in parents:
+                variable, step = parents[variable]
+                parity ^= step
+            return variable, parity
+        binary = {clause for clause in clauses if len(clause) == 2}
+        for first, second in binary:
+            if (first ^ 1, second ^ 1) in binary:
+                (root_1, parity_1), (root_2, parity_2) = find(first >> 1), find(second >> 1)
+                parity = parity_1 ^ parity_2 ^ (first & 1) ^ (second & 1) ^ 1
+                if root_1 == root_2:
+                    if parity:
+                        return None
+                    continue
+                parents[root_1] = (root_2, parity)
+        if not parents and not units:
+            return clauses, determined
+        if not parents:
+            continue
+
+        substituted = set()
+        for clause in clauses:
+            literals = set()
+            for element in clause:
+                root, parity = find(element >> 1)
+                literals.add(2 * root + ((element & 1) ^ parity))
+            if not any(element ^ 1 in literals for element in literals):
+                substituted.add(tuple(sorted(literals)))
+        clauses = list(substituted)
+        determined.update(parents)
+
+def getComponents(clauses):
+    """Splits clauses into groups that share no variable.
+
+    Returns a (clauses, variables) pair per group.
+    """
+    parents = {}
+    def find(variable):
+        root = variable
+        while parents[root] != root:
+            root = parents[root]
+        while parents[variable] != root:
+            parents[variable], variable = root, parents[variable]
+        return root
+    for clause in clauses:
+        first = clause[0] >> 1
+        parents.setdefault(first, first)
+        for element in clause[1:]:
+            variable = element >> 1
+            parents.setdefault(variable, variable)
+            parents[find(variable)] = find(first)
+    groups = {}
+    for clause in clauses:
+        groups.setdefault(find(clause[0] >> 1), []).append(clause)
+    return [(group, {element >> 1 for clause in group for element in clause}) for group in groups.values()]
+
+class ModelCounter:
+    """Counts the models of clauses by decomposition into components.
+
+    Unit clauses are propagated and equivalent variables merged first (see
+    'preprocess'). Then clauses that share no variable are counted separately
+    and their counts multiplied. Each component is split on its most frequent
+    variable, unit clauses being propagated after every decision, and its
+    count is cached by its clauses, so identical sub-problems met again, in this count or a
+    later one, are not explored twice. Counts are exact integers.
+
+    Sub-problems are explored with an explicit stack of generators, so the
+    number of decisions along a branch is not limited by recursion.
+    """
+    __slots__ = ('Cache',)
+
+    def __init__(self):
+        self.Cache = {}
+
+    def split(self, clauses, variables):
+        """Yields the sub-problems of a component and returns its count."""
+        key = tuple(sorted(clauses))
+        count = self.Cache.get(key)
+        if count is not None:
+            return count
+        frequency = {}
+        for clause in clauses:
+            for element in clause:
+                frequency[element >> 1] = frequency.get(element >> 1, 0) + 1
+        variable = max(frequency, key = frequency.__getitem__)
+        count = 0
+        for literal in (2 * variable, 2 * variable + 1):
+            result = simplify(clauses, (literal,))
+            if result is None:
+                continue
+            reduced, assigned = result
+            components = getComponents(reduced)
+            constrained = {element >> 1 for element in assigned}.union(*(group_variables for _, group_variables in components))
+            product = 2 ** len(variables - constrained)
+            for component in components:
+                product *= yield component
+                if not product:
+                    break
+            count += product
+        self.Cache[key] = count
+        return count
+
+    def count(self, clauses, variables: int):
+        """Returns the number of assignments of 'variables' variables satisfying the clauses."""
+        result = preprocess(list(set(clauses)))
+        if result is None:
+            return 0
+        clauses, determined = result
+        total = 2 ** (variables - len(determined) - len({element >> 1 for clause in clauses for element in clause}))
+        for component in getComponents(clauses):
+            stack = [self.split(*component)]
+            value = None
+            while stack:
+                try:
+                    request = stack[-1].send(value)
+                except StopIteration as stop:
+                    stack.pop()
+                    value = stop.value
+                else:
+                    stack.append(self.split(*request))
+                    value = None
+            total *= value
+            if not total:
+                break
+        return total
+
+def countModels(*statements, facts: dict = None, counter: ModelCounter = None):
+    """Returns the number of assignments of the statements' propositions making them True.
+
+    Connectives take the values their lookup tables imply for defined
+    propositions, so each assignment of the propositions is a single model.
+    A counter can be passed to reuse its cache across claim sets.
+    """
+    clauses, variables = getClauses(statements, facts)
+    return (counter or ModelCounter()).count(clauses.Clauses, clauses.Count)
+
+# Model enumeration:
+
+def iterateModels(*statements, facts: dict = None):
+    """Lazily yields the assignments of the statements' propositions making them True.
+
+    Each model is a dictionary of proposition values. Models are found one
+    at a time by the SAT solver, every model found being excluded before
+    looking for the next one, so taking the first k of them never enumerates
+    the others.
+    """
+    clauses, variables = getClauses(statements, facts)
+    solver = Solver()
+    solver.newVariables(clauses.Count)
+    for clause in clauses.Clauses:
+        solver.addClause(clause)
+    propositions = [(node, variable) for node, variable in variables.items() if isinstance(node, Proposition)]
+    while solver.solve():
+        model = {proposition: bool(solver.Model[variable]) for proposition, variable in propositions}
+        yield model
+        if not solver.addClause([2 * variable + model[proposition] for proposition, variable in propositions]):
+            return
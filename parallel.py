@@ -0,0 +1,110 @@
+import json
+import sys
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from os import cpu_count
+
+from formula import Parser
+from main import *
+
+# Claim set evaluation:
+
+def checkClaims(record: dict, warnings: bool = False):
+    """Evaluates a claim set and returns its result record.
+
+    A claim set names the values of its propositions under 'propositions'
+    (True, False or 'Undefined', by description) and lists its asserted
+    connectives under 'statements' as formulas, e.g.:
+
+        {"id": 7, "propositions": {"rains": true}, "statements": ["[rains ⟶ home]"]}
+
+    Every claim set is parsed with its own parser, so propositions are never
+    shared between claim sets. The result holds the claim set's id, whether it
+    is coherent, the propagated value of each proposition and the conflicting
+    connectives, and with 'warnings' the undefined values warnings of the
+    connectives left with undefined values.
+    """
+    parser = Parser()
+    knowledge_base = KnowledgeBase(*parser.parseAll(record.get('statements', [])))
+    for description, value in record.get('propositions', {}).items():
+        knowledge_base.setFact(parser.getProposition(description), value)
+    coherent = knowledge_base.propagate()
+    result = {
+        'id': record.get('id'),
+        'coherent': coherent,
+        'values': {description: VALUES[proposition.State] for description, proposition in parser.Propositions.items()},
+        'conflicts': [repr(connective) for connective in knowledge_base.Conflicts]
+    }
+    if warnings:
+        diagnostics = Diagnostics()
+        for connective in knowledge_base.Connectives:
+            states = connective.getStates()
+            if UNDEFINED in states:
+                diagnostics.record(connective, states)
+        result['warnings'] = [connective.getWarning(states) for connective, states in diagnostics.Records]
+    return result
+
+def checkLines(lines):
+    """Evaluates a chunk of JSON lines and returns a JSON line per claim set.
+
+    Blank lines are skipped. Claim sets that cannot be read or parsed give a
+    result with their 'error' instead of failing the whole chunk.
+    """
+    results = []
+    for line in lines:
+        if not line.strip():
+            continue
+        record = {}
+        try:
+            record = json.loads(line)
+            result = checkClaims(record)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            result = {'id': record.get('id') if isinstance(record, dict) else None, 'error': f'{type(error).__name__}: {error}'}
+        results.append(json.dumps(result, ensure_ascii = False))
+    return results
+
+# Parallel streaming:
+
+def checkStream(lines, workers: int = None, chunk: int = 256, backlog: int = 2):
+    """Lazily yields the JSON result line of each claim set of a stream.
+
+    Lines are read in chunks which are evaluated by a pool of 'workers'
+    processes, one per core by default. At most 'backlog' chunks per worker are
+    read ahead, so memory stays bounded however long the stream is, and
+    results are yielded in input order as soon as the oldest chunk is done.
+    """
+    if chunk < 1 or backlog < 1:
+        raise ValueError(f'Chunk size and backlog must be positive, got {chunk} and {backlog}.')
+    workers = workers or cpu_count() or 1
+    lines = iter(lines)
+    chunks = iter(lambda: list(islice(lines, chunk)), [])
+
+    if workers == 1:
+        for lines_chunk in chunks:
+            yield from checkLines(lines_chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for lines_chunk in chunks:
+            pending.append(executor.submit(checkLines, lines_chunk))
+            if len(pending) >= workers * backlog:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description = 'Checks JSON lines claim sets in parallel.')
+    parser.add_argument('input', nargs = '?', default = '-', help = 'JSON lines file of claim sets (standard input by default)')
+    parser.add_argument('-o', '--output', default = '-', help = 'JSON lines file of results (standard output by default)')
+    parser.add_argument('-w', '--workers', type = int, default = None, help = 'worker processes (one per core by default)')
+    parser.add_argument('-c', '--chunk', type = int, default = 256, help = 'claim sets per chunk')
+    arguments = parser.parse_args()
+
+    source = sys.stdin if arguments.input == '-' else open(arguments.input, encoding = 'utf-8')
+    target = sys.stdout if arguments.output == '-' else open(arguments.output, 'w', encoding = 'utf-8')
+    with source, target:
+        for result in checkStream(source, arguments.workers, arguments.chunk):
+            target.write(result + '\n')
@@ -0,0 +1,490 @@
+from heapq import heapify, heappop, heappush
+from itertools import product
+
+from main import *
+
+# Clause templates:
+
+TEMPLATES = {}
+
+def getTemplate(connective_class):
+    """Returns the prime implicates of a connective class's two-valued relation.
+
+    The relation holds every combination of boolean (connective, propositions)
+    values in which the connective has the value its lookup table implies for
+    those propositions. Each clause is a tuple of (position, value) pairs, the
+    connective being position 0, and is satisfied when any position takes its
+    value. Prime implicates are enough for unit propagation to derive every
+    value the relation forces.
+    """
+    template = TEMPLATES.get(connective_class)
+    if template is not None:
+        return template
+    table = connective_class.Table
+    arity = 1 if issubclass(connective_class, UnaryConnective) else 2
+    rows = [
+        (implied,) + operands
+        for operands in product((FALSE, TRUE), repeat = arity)
+        for implied in [table[encodeState((VALUES[UNDEFINED], tuple(VALUES[code] for code in operands)))][0]]
+    ]
+    implicates = []
+    for signs in product((None, FALSE, TRUE), repeat = arity + 1):
+        clause = tuple((position, sign) for position, sign in enumerate(signs) if sign is not None)
+        if clause and all(any(row[position] == sign for position, sign in clause) for row in rows):
+            implicates.append(clause)
+    template = TEMPLATES[connective_class] = tuple(
+        clause for clause in implicates
+        if not any(other != clause and set(other) <= set(clause) for other in implicates)
+    )
+    return template
+
+# Solver:
+
+def luby(index: int):
+    """Returns the index-th element (from 0) of the Luby restart sequence."""
+    size, sequence = 1, 0
+    while size < index + 1:
+        sequence += 1
+        size = 2 * size + 1
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        sequence -= 1
+        index %= size
+    return 2 ** sequence
+
+class Solver:
+    """Conflict-driven clause learning SAT solver.
+
+    Variables are numbered from 1 and literals are encoded as '2 * variable'
+    when positive and '2 * variable + 1' when negated, so that 'literal ^ 1'
+    is the opposite literal. Clauses are watched by their first two literals,
+    conflicts are analysed up to the first unique implication point and the
+    resulting clauses are learnt. Decisions follow variable activity (VSIDS)
+    with phase saving, and restarts follow the Luby sequence.
+
+    'solve' accepts assumption literals. When they cannot hold together, the
+    subset of them responsible for the conflict is left in 'Core'.
+    """
+    __slots__ = (
+        'Clauses', 'Watches', 'Assigns', 'Levels', 'Reasons', 'Phases', 'Activity', 'Increment',
+        'Heap', 'Trail', 'Limits', 'Head', 'Seen', 'Model', 'Core', 'Unsatisfiable'
+    )
+
+    def __init__(self):
+        self.Clauses = []
+        self.Watches = [[], []]
+        self.Assigns = [-1]
+        self.Levels = [0]
+        self.Reasons = [None]
+        self.Phases = [FALSE]
+        self.Activity = [0.0]
+        self.Increment = 1.0
+        self.Heap = []
+        self.Trail = []
+        self.Limits = []
+        self.Head = 0
+        self.Seen = [False]
+        self.Model = []
+        self.Core = []
+        self.Unsatisfiable = False
+
+    def newVariable(self):
+        """Adds a variable and returns its number."""
+        return self.newVariables(1)[0]
+
+    def newVariables(self, count: int):
+        """Adds the given number of variables and returns the range of their numbers."""
+        first = len(self.Assigns)
+        self.Watches += [[] for _ in range(2 * count)]
+        self.Assigns += [-1] * count
+        self.Levels += [0] * count
+        self.Reasons += [None] * count
+        self.Phases += [FALSE] * count
+        self.Activity += [0.0] * count
+        self.Seen += [False] * count
+        # No key is above (0.0, variable), so appending keeps the heap ordered:
+        self.Heap += [(0.0, variable) for variable in range(first, first + count)]
+        return range(first, first + count)
+
+    def getValue(self, literal: int):
+        """Returns 1, 0 or -1 when the literal is true, false or unassigned."""
+        value = self.Assigns[literal >> 1]
+        return value if value < 0 else value ^ (literal & 1)
+
+    def addClause(self, literals):
+        """Adds a clause at the root level. Returns False if it makes the formula unsatisfiable."""
+        if self.Limits:
+            self.backtrack(0)
+        clause = []
+        for literal in sorted(set(literals)):
+            value = self.getValue(literal)
+            if value == 1 or literal ^ 1 in clause:
+                return True
+            if value < 0:
+                clause.append(literal)
+        if not clause:
+            self.Unsatisfiable = True
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+            self.Unsatisfiable = self.Unsatisfiable or self.propagate() is not None
+        else:
+            self.attach(clause)
+        return not self.Unsatisfiable
+
+    def attach(self, clause):
+        """Stores a clause and watches its first two literals."""
+        self.Clauses.append(clause)
+        self.Watches[clause[0]].append(clause)
+        self.Watches[clause[1]].append(clause)
+
+    def enqueue(self, literal: int, reason):
+        """Makes a literal true at the current decision level."""
+        variable = literal >> 1
+        self.Assigns[variable] = (literal & 1) ^ 1
+        self.Levels[variable] = len(self.Limits)
+        self.Reasons[variable] = reason
+        self.Trail.append(literal)
+
+    def propagate(self):
+        """Propagates the pending assignments. Returns a conflicting clause, if any."""
+        assigns = self.Assigns
+        watches = self.Watches
+        trail = self.Trail
+        while self.Head < len(trail):
+            false = trail[self.Head] ^ 1
+            self.Head += 1
+            watching = watches[false]
+            kept = []
+            index = 0
+            while index < len(watching):
+                clause = watching[index]
+                index += 1
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                first = clause[0]
+                value = assigns[first >> 1]
+                if value >= 0 and value ^ (first & 1) == 1:
+                    kept.append(clause)
+                    continue
+                for position in range(2, len(clause)):
+                    literal = clause[position]
+                    value = assigns[literal >> 1]
+                    if value < 0 or value ^ (literal & 1) == 1:
+                        clause[1], clause[position] = literal, false
+                        watches[literal].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    value = assigns[first >> 1]
+                    if value >= 0:
+                        kept.extend(watching[index:])
+                        watches[false] = kept
+                        self.Head = len(trail)
+                        return clause
+                    self.enqueue(first, clause)
+            watches[false] = kept
+        return None
+
+    def backtrack(self, level: int):
+        """Undoes every assignment above the given decision level."""
+        if len(self.Limits) <= level:
+            return
+        start = self.Limits[level]
+        for literal in self.Trail[start:]:
+            variable = literal >> 1
+            self.Phases[variable] = self.Assigns[variable]
+            self.Assigns[variable] = -1
+            self.Reasons[variable] = None
+            heappush(self.Heap, (-self.Activity[variable], variable))
+        del self.Trail[start:]
+        del self.Limits[level:]
+        self.Head = start
+
+    def bump(self, variable: int):
+        """Increases a variable's activity, rescaling all of them if needed."""
+        self.Activity[variable] += self.Increment
+        if self.Activity[variable] > 1e100:
+            self.Activity = [activity * 1e-100 for activity in self.Activity]
+            self.Increment *= 1e-100
+            self.Heap = [(-self.Activity[variable], variable) for variable in range(1, len(self.Assigns)) if self.Assigns[variable] < 0]
+            heapify(self.Heap)
+        elif self.Assigns[variable] < 0:
+            heappush(self.Heap, (-self.Activity[variable], variable))
+
+    def analyze(self, conflict):
+        """Returns the first-UIP learnt clause for a conflict and its backjump level."""
+        seen = self.Seen
+        levels = self.Levels
+        level = len(self.Limits)
+        learnt = [None]
+        pending = 0
+        literal = None
+        index = len(self.Trail) - 1
+        clause = conflict
+        while True:
+            for other in (clause if literal is None else clause[1:]):
+                variable = other >> 1
+                if not seen[variable] and levels[variable] > 0:
+                    seen[variable] = True
+                    self.bump(variable)
+                    if levels[variable] >= level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+            while not seen[self.Trail[index] >> 1]:
+                index -= 1
+            literal = self.Trail[index]
+            index -= 1
+            seen[literal >> 1] = False
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.Reasons[literal >> 1]
+            if clause[0] != literal:
+                position = clause.index(literal)
+                clause[0], clause[position] = clause[position], clause[0]
+        learnt[0] = literal ^ 1
+
+        # Drops literals implied by the rest of the clause through their reasons:
+        minimized = [learnt[0]]
+        for other in learnt[1:]:
+            reason = self.Reasons[other >> 1]
+            if reason is None or not all(seen[implied >> 1] or levels[implied >> 1] == 0 for implied in reason if implied != other ^ 1):
+                minimized.append(other)
+        for other in learnt[1:]:
+            seen[other >> 1] = False
+        self.Increment *= 1.05
+
+        if len(minimized) == 1:
+            return minimized, 0
+        deepest = max(range(1, len(minimized)), key = lambda position: levels[minimized[position] >> 1])
+        minimized[1], minimized[deepest] = minimized[deepest], minimized[1]
+        return minimized, levels[minimized[1] >> 1]
+
+    def analyzeFinal(self, literal: int):
+        """Returns the assumptions that imply the given (false) assumption's negation."""
+        core = [literal]
+        if not self.Limits:
+            return core
+        seen = self.Seen
+        seen[literal >> 1] = True
+        for trailed in reversed(self.Trail[self.Limits[0]:]):
+            variable = trailed >> 1
+            if not seen[variable]:
+                continue
+            reason = self.Reasons[variable]
+            if reason is None:
+                core.append(trailed)
+            else:
+                for other in reason[1:]:
+                    if self.Levels[other >> 1] > 0:
+                        seen[other >> 1] = True
+            seen[variable] = False
+        seen[literal >> 1] = False
+        return core
+
+    def decide(self):
+        """Returns the next unassigned variable by activity, or None."""
+        while self.Heap:
+            activity, variable = heappop(self.Heap)
+            if self.Assigns[variable] < 0 and -activity == self.Activity[variable]:
+                return variable
+        for variable in range(1, len(self.Assigns)):
+            if self.Assigns[variable] < 0:
+                return variable
+        return None
+
+    def solve(self, assumptions = ()):
+        """Searches for a model satisfying every clause and assumption.
+
+        Returns True and fills 'Model' (a value per variable, index 0 unused)
+        if one exists. Otherwise returns False and leaves the conflicting
+        assumptions in 'Core', which is empty when the clauses alone are
+        unsatisfiable.
+        """
+        self.Model = []
+        self.Core = []
+        if self.Unsatisfiable:
+            return False
+        self.backtrack(0)
+        if self.propagate() is not None:
+            self.Unsatisfiable = True
+            return False
+        restarts = 0
+        conflicts = 0
+        budget = 100 * luby(restarts)
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                conflicts += 1
+                if not self.Limits:
+                    self.Unsatisfiable = True
+                    return False
+                learnt, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.attach(learnt)
+                    self.enqueue(learnt[0], learnt)
+                continue
+            if conflicts >= budget:
+                restarts += 1
+                conflicts = 0
+                budget = 100 * luby(restarts)
+                self.backtrack(0)
+                continue
+            literal = None
+            while len(self.Limits) < len(assumptions):
+                assumption = assumptions[len(self.Limits)]
+                value = self.getValue(assumption)
+                if value == 1:
+                    self.Limits.append(len(self.Trail))
+                elif value == 0:
+                    self.Core = self.analyzeFinal(assumption)
+                    self.backtrack(0)
+                    return False
+                else:
+                    literal = assumption
+                    break
+            if literal is None:
+                variable = self.decide()
+                if variable is None:
+                    self.Model = [assign == TRUE for assign in self.Assigns]
+                    self.backtrack(0)
+                    return True
+                literal = 2 * variable + (self.Phases[variable] != TRUE)
+            self.Limits.append(len(self.Trail))
+            self.enqueue(literal, None)
+
+# Consistency checking:
+
+class Consistency:
+    """Result of checking a set of asserted statements.
+
+    'Model' maps every proposition to a boolean value when the statements are
+    coherent. Otherwise 'Conflict' holds a subset of the statements that cannot
+    hold together, and 'Minimal' tells whether it was proven minimal: removing
+    any of its statements makes the rest coherent.
+    """
+    __slots__ = ('Coherent', 'Model', 'Conflict', 'Minimal')
+
+    def __init__(self, coherent: bool, model: dict, conflict: list, minimal: bool = True):
+        self.Coherent = coherent
+        self.Model = model
+        self.Conflict = conflict
+        self.Minimal = minimal
+
+    def __repr__(self):
+        return f'Consistency(coherent={self.Coherent}, conflict={self.Conflict}, minimal={self.Minimal})'
+
+    def apply(self):
+        """Sets every proposition to its value in the model (see 'assign')."""
+        assign(self.Model)
+
+def encodeAnd(solver: Solver, output: int, operands):
+    """Adds the clauses of 'output = operand_1 ^ ... ^ operand_n'."""
+    for operand in operands:
+        solver.addClause([2 * output + 1, 2 * operand])
+    solver.addClause([2 * output] + [2 * operand + 1 for operand in operands])
+
+def encodeOr(solver: Solver, output: int, operands):
+    """Adds the clauses of 'output = operand_1 v ... v operand_n'."""
+    for operand in operands:
+        solver.addClause([2 * output, 2 * operand + 1])
+    solver.addClause([2 * output + 1] + [2 * operand for operand in operands])
+
+def encodeXOr(solver: Solver, output: int, operands):
+    """Adds the clauses of 'output = operand_1 xv ... xv operand_n'.
+
+    The parity is chained through a new variable per intermediate operand.
+    """
+    current = operands[0]
+    for index, operand in enumerate(operands[1:], 2):
+        result = output if index == len(operands) else solver.newVariable()
+        solver.addClause([2 * result + 1, 2 * current, 2 * operand])
+        solver.addClause([2 * result + 1, 2 * current + 1, 2 * operand + 1])
+        solver.addClause([2 * result, 2 * current + 1, 2 * operand])
+        solver.addClause([2 * result, 2 * current, 2 * operand + 1])
+        current = result
+
+VARIADIC = {And: encodeAnd, Or: encodeOr, XOr: encodeXOr}
+
+def encode(solver: Solver, statements):
+    """Adds the two-valued definitions of the statements' graph to a solver.
+
+    Every node gets a variable, and every connective the instantiated clauses
+    of its class template, or those of its variadic encoding when it has more
+    than two propositions. Returns the variable of each node.
+    """
+    nodes = traverse(*statements)
+    variables = dict(zip(nodes, solver.newVariables(len(nodes))))
+    for node in nodes:
+        if isinstance(node, Proposition):
+            continue
+        positions = [variables[node]] + [variables[operand] for operand in node.getOperands()]
+        if len(positions) > 3:
+            VARIADIC[type(node)](solver, positions[0], positions[1:])
+            continue
+        # Clauses over distinct fresh variables need no simplification:
+        add = solver.attach if len(set(positions)) == len(positions) else solver.addClause
+        for clause in getTemplate(type(node)):
+            literals = [2 * positions[position] + (sign == FALSE) for position, sign in clause]
+            if len(literals) == 1:
+                solver.addClause(literals)
+            else:
+                add(literals)
+    return variables
+
+def checkConsistency(*statements, minimize: bool = True, limit: int = 100):
+    """Checks whether the given statements can all be True at the same time.
+
+    Each statement is guarded by an assumption, so that an unsatisfiable set
+    is narrowed down to the statements in the solver's final conflict. If
+    'minimize' is set, the conflict is then solved again on its own while that
+    shrinks it, and reduced to a minimal subset by trying to drop each of its
+    statements in turn. Minimization makes at most 'limit' more solver calls
+    (None for no limit): a conflict with more statements than the calls left
+    is returned as it is, and is not marked 'Minimal'.
+    """
+    if limit is not None and limit < 0:
+        raise ValueError(f'Minimization limit must not be negative, got {limit}.')
+    solver = Solver()
+    variables = encode(solver, statements)
+    selectors = {}
+    for statement in statements:
+        selector = solver.newVariable()
+        selectors[2 * selector] = statement
+        solver.addClause([2 * selector + 1, 2 * variables[statement]])
+
+    assumptions = list(selectors)
+    if solver.solve(assumptions):
+        model = {node: solver.Model[variable] for node, variable in variables.items() if isinstance(node, Proposition)}
+        return Consistency(True, model, [])
+
+    failed = set(solver.Core)
+    core = [literal for literal in assumptions if literal in failed]
+    if not minimize:
+        return Consistency(False, {}, [selectors[literal] for literal in core], len(core) <= 1)
+
+    calls = 0
+    while limit is None or calls < limit:
+        calls += 1
+        solver.solve(core)
+        failed = set(solver.Core)
+        if len(failed) == len(core):
+            break
+        core = [literal for literal in core if literal in failed]
+
+    if limit is not None and len(core) > limit - calls:
+        return Consistency(False, {}, [selectors[literal] for literal in core], len(core) <= 1)
+    index = 0
+    while index < len(core):
+        calls += 1
+        candidate = core[:index] + core[index + 1:]
+        if solver.solve(candidate):
+            index += 1
+        else:
+            failed = set(solver.Core)
+            core = [literal for literal in candidate if literal in failed]
+    return Consistency(False, {}, [selectors[literal] for literal in core])
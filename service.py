@@ -0,0 +1,284 @@
+import asyncio
+import json
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import monotonic, perf_counter
+
+from parallel import checkClaims
+
+# Batch evaluation:
+
+def checkBatch(records):
+    """Evaluates a batch of claim sets, returning a result per claim set.
+
+    Runs in a worker process. Claim sets that cannot be parsed give a result
+    with their 'error' instead of failing the whole batch.
+    """
+    results = []
+    for record in records:
+        try:
+            results.append(checkClaims(record, warnings = True))
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            results.append({'id': record.get('id'), 'error': f'{type(error).__name__}: {error}'})
+    return results
+
+# Service:
+
+class Service:
+    """Local fact checking service speaking JSON lines.
+
+    Each request line is a claim set, as read by 'parallel.checkClaims':
+    formulas in the connectives' representation syntax under 'statements',
+    and evidence as proposition values under 'propositions'. Each response
+    line holds the claim set's result, with the warnings of the connectives
+    left with undefined values, and responses come back in request order on
+    every connection. A '{"metrics": true}' line is answered with 'getMetrics'.
+
+    Requests from every connection are coalesced into batches of up to
+    'BatchSize' claim sets, collected for at most 'Window' seconds after the
+    first one, and evaluated by a pool of 'Workers' processes, so the event
+    loop never runs connectives itself. At most one batch per worker is in
+    flight. Backpressure comes from bounded queues: once 'QueueSize' claim
+    sets wait for a batch, or 'Pipeline' responses are pending on a
+    connection, the connection is no longer read until there is room again.
+    """
+    __slots__ = (
+        'Workers', 'BatchSize', 'Window', 'QueueSize', 'Pipeline', 'Queue', 'Executor', 'Server', 'Batcher', 'Slots', 'Tasks', 'Connections',
+        'Started', 'Requests', 'Responses', 'Errors', 'Warnings', 'Batches', 'Batched', 'Latencies'
+    )
+
+    def __init__(self, workers: int = 1, batch_size: int = 64, window: float = 0.002, queue_size: int = 1024, pipeline: int = 64):
+        if min(workers, batch_size, queue_size, pipeline) < 1 or window < 0:
+            raise ValueError('Workers, batch, queue and pipeline sizes must be positive and the window non-negative.')
+        self.Workers = workers
+        self.BatchSize = batch_size
+        self.Window = window
+        self.QueueSize = queue_size
+        self.Pipeline = pipeline
+        self.Queue = None
+        self.Executor = None
+        self.Server = None
+        self.Batcher = None
+        self.Slots = None
+        self.Tasks = set()
+        self.Connections = set()
+        self.Started = None
+        self.Requests = 0
+        self.Responses = 0
+        self.Errors = 0
+        self.Warnings = 0
+        self.Batches = 0
+        self.Batched = 0
+        self.Latencies = deque(maxlen = 10000)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: str = None):
+        """Starts serving on a Unix socket if 'path' is given, else on TCP.
+
+        Returns the socket's address, which holds the chosen port when 'port'
+        is 0.
+        """
+        self.Queue = asyncio.Queue(self.QueueSize)
+        self.Slots = asyncio.Semaphore(self.Workers)
+        # Forked workers would inherit the open sockets, and keep connections
+        # open after the service closes them:
+        self.Executor = ProcessPoolExecutor(self.Workers, mp_context = get_context('spawn'))
+        self.Started = monotonic()
+        self.Batcher = asyncio.create_task(self.batch())
+        if path is None:
+            self.Server = await asyncio.start_server(self.handle, host, port)
+        else:
+            self.Server = await asyncio.start_unix_server(self.handle, path)
+        return self.Server.sockets[0].getsockname()
+
+    async def stop(self):
+        """Stops accepting connections and batching, and shuts the workers down.
+
+        Open connections are closed, and batches in flight and claim sets
+        waiting for one are cancelled. The workers are shut down in a thread,
+        so the event loop keeps running while they exit.
+        """
+        if self.Server is not None:
+            self.Server.close()
+        tasks = [task for task in (self.Batcher, *self.Tasks, *self.Connections) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions = True)
+        if self.Server is not None:
+            # Since Python 3.12.1, this also waits for every connection to close:
+            await self.Server.wait_closed()
+        if self.Queue is not None:
+            while not self.Queue.empty():
+                _, future, _ = self.Queue.get_nowait()
+                future.cancel()
+        if self.Executor is not None:
+            await asyncio.to_thread(self.Executor.shutdown, cancel_futures = True)
+        self.Server = self.Batcher = self.Executor = None
+
+    async def check(self, record: dict):
+        """Queues a claim set for the next batch and returns its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self.Queue.put((record, future, perf_counter()))
+        return await future
+
+    async def batch(self):
+        """Collects queued claim sets into batches and hands them to the workers."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.Slots.acquire()
+            items = [await self.Queue.get()]
+            deadline = loop.time() + self.Window
+            while len(items) < self.BatchSize:
+                if self.Queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(self.Queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    items.append(self.Queue.get_nowait())
+            task = asyncio.create_task(self.evaluate(items))
+            self.Tasks.add(task)
+            task.add_done_callback(self.Tasks.discard)
+
+    async def evaluate(self, items):
+        """Evaluates a batch in the workers and resolves its requests."""
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.Executor, checkBatch, [record for record, _, _ in items])
+        except asyncio.CancelledError:
+            for _, future, _ in items:
+                future.cancel()
+            raise
+        except Exception as error:
+            results = [{'id': record.get('id'), 'error': f'{type(error).__name__}: {error}'} for record, _, _ in items]
+        finally:
+            self.Slots.release()
+        self.Batches += 1
+        self.Batched += len(items)
+        end = perf_counter()
+        for (_, future, start), result in zip(items, results):
+            self.Latencies.append(end - start)
+            if not future.done():
+                future.set_result(result)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves a connection: reads requests and writes responses in order."""
+        pending = asyncio.Queue(self.Pipeline)
+        connection = asyncio.current_task()
+        self.Connections.add(connection)
+
+        async def respond():
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+                task, counted = item
+                result = await task
+                if counted:
+                    self.Responses += 1
+                    if 'error' in result:
+                        self.Errors += 1
+                    self.Warnings += len(result.get('warnings', ()))
+                writer.write((json.dumps(result, ensure_ascii = False) + '\n').encode('utf-8'))
+                await writer.drain()
+
+        responder = asyncio.create_task(respond())
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError('A claim set must be a JSON object.')
+                except ValueError as error:
+                    self.Requests += 1
+                    task = asyncio.get_running_loop().create_future()
+                    task.set_result({'id': None, 'error': f'{type(error).__name__}: {error}'})
+                    await pending.put((task, True))
+                    continue
+                if record.get('metrics'):
+                    task = asyncio.get_running_loop().create_future()
+                    task.set_result(self.getMetrics())
+                    await pending.put((task, False))
+                else:
+                    self.Requests += 1
+                    await pending.put((asyncio.create_task(self.check(record)), True))
+            await pending.put(None)
+            await responder
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.Connections.discard(connection)
+            responder.cancel()
+            writer.close()
+
+    def getMetrics(self):
+        """Returns the request, batch, latency and throughput counters.
+
+        Requests and responses count every line but metrics ones, malformed
+        lines included, which count as errors too.
+        """
+        latencies = sorted(self.Latencies)
+        def getPercentile(fraction: float):
+            return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] if latencies else None
+        elapsed = monotonic() - self.Started if self.Started is not None else 0.0
+        return {
+            'requests': self.Requests,
+            'responses': self.Responses,
+            'errors': self.Errors,
+            'warnings': self.Warnings,
+            'queued': self.Queue.qsize() if self.Queue is not None else 0,
+            'batches': self.Batches,
+            'batch_size': self.Batched / self.Batches if self.Batches else None,
+            'latency': {'p50': getPercentile(0.5), 'p95': getPercentile(0.95), 'p99': getPercentile(0.99), 'max': latencies[-1] if latencies else None},
+            'throughput': self.Batched / elapsed if elapsed else None
+        }
+
+# Client:
+
+async def query(records, host: str = '127.0.0.1', port: int = None, path: str = None):
+    """Sends claim sets to a running service and returns its responses, in order."""
+    if path is None:
+        reader, writer = await asyncio.open_connection(host, port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(path)
+
+    async def send():
+        for record in records:
+            writer.write((json.dumps(record, ensure_ascii = False) + '\n').encode('utf-8'))
+            await writer.drain()
+        writer.write_eof()
+
+    sender = asyncio.create_task(send())
+    responses = [json.loads(line) async for line in reader]
+    await sender
+    writer.close()
+    return responses
+
+async def serve(host: str, port: int, path: str, **options):
+    """Runs a service until cancelled."""
+    service = Service(**options)
+    address = await service.start(host, port, path)
+    print(f'Serving on {address}')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description = 'Local fact checking service speaking JSON lines.')
+    parser.add_argument('-H', '--host', default = '127.0.0.1', help = 'TCP host to listen on')
+    parser.add_argument('-p', '--port', type = int, default = 8765, help = 'TCP port to listen on')
+    parser.add_argument('-u', '--unix', default = None, help = 'Unix socket path to listen on instead of TCP')
+    parser.add_argument('-w', '--workers', type = int, default = 1, help = 'worker processes')
+    parser.add_argument('-b', '--batch', type = int, default = 64, help = 'maximum claim sets per batch')
+    parser.add_argument('-t', '--window', type = float, default = 0.002, help = 'seconds to wait for a batch to fill')
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.unix, workers = arguments.workers, batch_size = arguments.batch, window = arguments.window))
+    except KeyboardInterrupt:
+        pass
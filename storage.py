@@ -0,0 +1,271 @@
+import gc
+import mmap
+import struct
+import sys
+from array import array
+
+from main import *
+
+# File format:
+#
+# A header is followed by fixed-width arrays with an entry per node, nodes
+# being stored operands first (see 'traverse'):
+#
+#     Header        magic, version, byte order and the sizes of the arrays.
+#     Offsets       uint32[nodes + 1], start of each node's operands.
+#     Operands      uint32[operands], node indices.
+#     Spans         uint32[nodes + 1], start of each node's name.
+#     Statements    uint32[statements], node indices.
+#     Kinds         uint8[nodes], position of each node's class in 'KINDS'.
+#     States        uint8[nodes], value codes.
+#     Facts         uint8[nodes], fact value codes ('Undefined' if none).
+#     Names         UTF-8 proposition descriptions, connectives having none.
+#
+# The uint32 arrays come first, so that every array is aligned.
+
+MAGIC = b'LGKB'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHIIII')
+KINDS = (Proposition, Yes, Not, And, Or, XOr, Implicative, BiImplicative)
+BYTEORDERS = ('little', 'big')
+
+def getKind(node):
+    """Returns the position of a node's class in 'KINDS'."""
+    if isinstance(node, Proposition):
+        return 0
+    for index, kind in enumerate(KINDS):
+        if type(node) is kind:
+            return index
+    raise ValueError(f"Cannot store '{node}': {type(node).__name__} is not a stored connective class.")
+
+def dump(knowledge_base: KnowledgeBase, path: str):
+    """Writes a knowledge base, its nodes' values and its facts to a file."""
+    nodes = traverse(*knowledge_base.Statements)
+    graph = set(nodes)
+    nodes += [proposition for proposition in knowledge_base.Propositions if proposition not in graph]
+    indices = {node: index for index, node in enumerate(nodes)}
+
+    offsets, operands, spans = array('I', [0]), array('I'), array('I', [0])
+    kinds, states, facts = bytearray(), bytearray(), bytearray()
+    names = []
+    size = 0
+    for node in nodes:
+        kinds.append(getKind(node))
+        states.append(node.State)
+        facts.append(knowledge_base.Facts.get(node, UNDEFINED))
+        if isinstance(node, Proposition):
+            name = str(node.Description).encode('utf-8')
+            names.append(name)
+            size += len(name)
+        else:
+            operands.extend(indices[operand] for operand in node.getOperands())
+        offsets.append(len(operands))
+        spans.append(size)
+    statements = array('I', [indices[statement] for statement in knowledge_base.Statements])
+
+    with open(path, 'wb') as stream:
+        stream.write(HEADER.pack(MAGIC, VERSION, BYTEORDERS.index(sys.byteorder), 0, len(nodes), len(operands), len(statements), size))
+        for section in (offsets, operands, spans, statements, kinds, states, facts):
+            stream.write(section)
+        stream.write(b''.join(names))
+
+# Memory-mapped loading:
+
+class KnowledgeBaseFile:
+    """Read-only view of a stored knowledge base.
+
+    The file is memory-mapped and every array is a memoryview over the
+    mapping, so opening it takes constant time and memory whatever its size:
+    pages are only read from disk when queried. Nodes are referred to by
+    index, and Python objects are only built on request (see 'materialize').
+
+    Files written on a machine of the other byte order are copied into
+    byte-swapped arrays instead.
+    """
+    __slots__ = ('File', 'Map', 'Count', 'Offsets', 'Operands', 'Spans', 'Statements', 'Kinds', 'States', 'Facts', 'Names', 'Indices')
+
+    def __init__(self, path: str):
+        self.File = open(path, 'rb')
+        try:
+            self.Map = mmap.mmap(self.File.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            self.File.close()
+            raise ValueError(f"'{path}' is not a stored knowledge base.")
+        try:
+            magic, version, byteorder, _, count, operands, statements, size = HEADER.unpack_from(self.Map)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a version {VERSION} stored knowledge base.")
+
+        layout = ((count + 1, 4), (operands, 4), (count + 1, 4), (statements, 4), (count, 1), (count, 1), (count, 1), (size, 1))
+        if HEADER.size + sum(length * width for length, width in layout) > len(self.Map):
+            self.close()
+            raise ValueError(f"'{path}' is truncated.")
+
+        view = memoryview(self.Map)
+        position = HEADER.size
+        sections = []
+        for length, width in layout:
+            section = view[position:position + length * width]
+            if width == 4:
+                if BYTEORDERS[byteorder] == sys.byteorder:
+                    section = section.cast('I')
+                else:
+                    section = array('I', section)
+                    section.byteswap()
+            sections.append(section)
+            position += length * width
+        self.Count = count
+        self.Offsets, self.Operands, self.Spans, self.Statements, self.Kinds, self.States, self.Facts, self.Names = sections
+        self.Indices = None
+
+    def __len__(self):
+        return self.Count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        """Releases the arrays and unmaps the file."""
+        for name in ('Offsets', 'Operands', 'Spans', 'Statements', 'Kinds', 'States', 'Facts', 'Names'):
+            section = getattr(self, name, None)
+            if isinstance(section, memoryview):
+                section.release()
+        if getattr(self, 'Map', None) is not None:
+            self.Map.close()
+        self.File.close()
+
+    # Queries:
+
+    def getKind(self, index: int):
+        """Returns the class of a node."""
+        return KINDS[self.Kinds[index]]
+
+    def getValue(self, index: int):
+        """Returns the stored value of a node."""
+        return VALUES[self.States[index]]
+
+    def getFact(self, index: int):
+        """Returns the fact set on a proposition, 'Undefined' if none."""
+        return VALUES[self.Facts[index]]
+
+    def getOperands(self, index: int):
+        """Returns the indices of a node's operands."""
+        return tuple(self.Operands[self.Offsets[index]:self.Offsets[index + 1]])
+
+    def getDescription(self, index: int):
+        """Returns the description of a proposition."""
+        return bytes(self.Names[self.Spans[index]:self.Spans[index + 1]]).decode('utf-8')
+
+    def getStatements(self):
+        """Returns the indices of the asserted statements."""
+        return tuple(self.Statements)
+
+    def getIndex(self, description: str):
+        """Returns the index of the proposition with the given description.
+
+        The descriptions index is built on the first call.
+        """
+        if self.Indices is None:
+            self.Indices = {}
+            for index in range(self.Count):
+                if self.Kinds[index] == 0:
+                    self.Indices.setdefault(self.getDescription(index), index)
+        if description not in self.Indices:
+            raise ValueError(f"No proposition described as '{description}'.")
+        return self.Indices[description]
+
+    def getRepr(self, index: int):
+        """Returns the representation the node would have once materialized."""
+        results = {}
+        stack = [index]
+        while stack:
+            current = stack[-1]
+            if current in results:
+                stack.pop()
+                continue
+            if self.Kinds[current] == 0:
+                results[current] = self.getDescription(current)
+                stack.pop()
+                continue
+            operands = self.getOperands(current)
+            missing = [operand for operand in operands if operand not in results]
+            if missing:
+                stack += missing
+                continue
+            kind = self.getKind(current)
+            if issubclass(kind, UnaryConnective):
+                results[current] = f'[{kind.Symbol}{results[operands[0]]}]'
+            else:
+                results[current] = '[' + f' {kind.Symbol} '.join(results[operand] for operand in operands) + ']'
+            stack.pop()
+        return results[index]
+
+    # Materialization:
+
+    def materialize(self, indices = None):
+        """Builds the Python objects of the given nodes and everything below them.
+
+        Connectives are restored with their stored values instead of being
+        evaluated, so nothing changes on the way. Returns a dictionary of
+        nodes by index, for every node by default.
+        """
+        if indices is None:
+            needed = range(self.Count)
+        else:
+            needed = set()
+            stack = list(indices)
+            while stack:
+                index = stack.pop()
+                if index not in needed:
+                    needed.add(index)
+                    stack += self.Operands[self.Offsets[index]:self.Offsets[index + 1]]
+            needed = sorted(needed)
+
+        nodes = {}
+        # Nothing built here is garbage, so collections would only rescan it:
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for index in needed:
+                kind = KINDS[self.Kinds[index]]
+                if kind is Proposition:
+                    node = Proposition(self.getDescription(index))
+                else:
+                    node = kind.__new__(kind)
+                    node.Verbose = False
+                    node.Dependents = DependentList()
+                    operands = tuple(nodes[operand] for operand in self.Operands[self.Offsets[index]:self.Offsets[index + 1]])
+                    if issubclass(kind, UnaryConnective):
+                        node.Proposition = operands[0]
+                    else:
+                        node.Propositions = operands
+                    node.register()
+                node.State = self.States[index]
+                nodes[index] = node
+        finally:
+            if collecting:
+                gc.enable()
+        return nodes
+
+    def load(self):
+        """Returns the stored knowledge base with its facts and values."""
+        nodes = self.materialize()
+        knowledge_base = KnowledgeBase(*[nodes[index] for index in self.Statements])
+        for index, node in nodes.items():
+            if self.Kinds[index] == 0 and self.Facts[index] != UNDEFINED:
+                knowledge_base.setFact(node, VALUES[self.Facts[index]])
+            elif self.Kinds[index] == 0 and node not in knowledge_base.Nodes:
+                knowledge_base.Nodes.add(node)
+                knowledge_base.Propositions.append(node)
+        return knowledge_base
+
+def load(path: str):
+    """Reads a knowledge base written by 'dump'."""
+    with KnowledgeBaseFile(path) as stored:
+        return stored.load()
@@ -66,3 +66,557 @@ s6 = Or(p, r)
 s7 = XOr(p, r)
 
 summary(p, q, s1, s2, s3, s4, s5, s6, s7, info = 'test 4')
+
+# Test 5: Knowledge base propagation (order independent incoherence detection)
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+
+s1 = Implicative(p, And(q, r))
+s2 = Not(q)
+s3 = Yes(p)
+
+kb = KnowledgeBase(s1, s2, s3)
+kb.propagate()
+
+summary(p, q, r, s1, s2, s3, info = 'test 5')
+print(f"Coherent: {kb.isCoherent()}, conflicts: {kb.Conflicts}\n")
+
+# Test 6: Incremental re-evaluation of dependent connectives
+
+p = Proposition('rains')
+q = Proposition('home')
+r = Proposition('cafe')
+
+s1 = Yes(p)
+s2 = Implicative(p, Or(q, r))
+
+q.setSelfValue(False)
+r.setSelfValue(False)
+
+summary(p, q, r, s1, s2, info = 'test 6')
+
+# Test 7: Consistency checking
+
+from sat import checkConsistency
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+
+s1 = Yes(p)
+s2 = Not(q)
+s3 = Implicative(p, And(q, r))
+s4 = Implicative(p, Or(q, r))
+
+print(f"{checkConsistency(s1, s2, s3)}\n{checkConsistency(s1, s2, s4)}\n")
+
+chain = [Proposition(f'step {index}') for index in range(51)]
+statements = [Implicative(first, second) for first, second in zip(chain, chain[1:])] + [Yes(chain[0]), Not(chain[-1])]
+assert not checkConsistency(*statements, limit = 10).Minimal
+assert len(checkConsistency(*statements, limit = None).Conflict) == len(statements)
+
+# Test 8: Variadic connectives
+
+p = Proposition('rains')
+q = Proposition('home')
+r = Proposition('cafe')
+
+s1 = And(p, q, r)
+s2 = Or(p, q, r)
+s3 = XOr(p, q, r)
+
+p.setSelfValue(False)
+
+summary(p, q, r, s1, s2, s3, info = 'test 8')
+
+# Test 9: Hypotheses on a knowledge base
+
+p = Proposition('rains')
+q = Proposition('home')
+r = Proposition('cafe')
+
+s1 = Implicative(p, Or(q, r))
+s2 = Not(r)
+
+kb = KnowledgeBase(s1, s2)
+kb.propagate()
+
+kb.assume(p, True)
+summary(p, q, r, s1, s2, info = 'test 9 (assuming rains)')
+kb.retract()
+summary(p, q, r, s1, s2, info = 'test 9 (retracted)')
+
+# Test 10: Knowledge base deductions from asserted connectives
+
+cases = (
+    (lambda x, y: And(x, y), (True, True)),
+    (lambda x, y: Not(Or(x, y)), (False, False)),
+    (lambda x, y: Not(Implicative(x, y)), (True, False)),
+    (lambda x, y: And(x, y, Proposition('z')), (True, True))
+)
+
+for build, expected in cases:
+    x = Proposition('x')
+    y = Proposition('y')
+    kb = KnowledgeBase(build(x, y))
+    kb.propagate()
+    assert (x.Value, y.Value) == expected, kb.Statements
+
+x = Proposition('x')
+y = Proposition('y')
+
+kb = KnowledgeBase(And(x, y))
+kb.propagate()
+
+summary(x, y, info = 'test 10')
+
+# Test 11: Re-evaluation gives the values of a rebuild when no connective sets a proposition read before it
+
+def build(p, q, r):
+    o = Or(q, r)
+    return Yes(p), o, Implicative(p, o)
+
+p = Proposition('rains')
+q = Proposition('home')
+r = Proposition('cafe')
+
+s1, s2, s3 = build(p, q, r)
+q.setSelfValue(False)
+
+p_rebuilt = Proposition('rains')
+q_rebuilt = Proposition('home')
+r_rebuilt = Proposition('cafe')
+q_rebuilt.setSelfValue(False)
+
+rebuilt = (p_rebuilt, q_rebuilt, r_rebuilt) + build(p_rebuilt, q_rebuilt, r_rebuilt)
+assert [node.Value for node in (p, q, r, s1, s2, s3)] == [node.Value for node in rebuilt]
+
+summary(p, q, r, s1, s2, s3, info = 'test 11')
+
+a = Proposition('a')
+b = Proposition('b')
+s4 = XOr(b, XOr(a, b))
+a.setSelfValue(False)
+assert b.Value is False
+
+a_rebuilt = Proposition('a')
+b_rebuilt = Proposition('b')
+a_rebuilt.setSelfValue(False)
+XOr(b_rebuilt, XOr(a_rebuilt, b_rebuilt))
+assert b_rebuilt.Value is True
+
+for _ in range(1000):
+    Yes(p)
+assert len(p.Dependents) <= 16
+assert s3 in set(p.Dependents)
+
+# Test 12: Variadic connectives match their nested binary form
+
+from itertools import product
+
+for connective in (And, Or, XOr):
+    for states in product((True, False, 'Undefined'), repeat = 3):
+        flat = [Proposition(name) for name in 'abc']
+        nested = [Proposition(name) for name in 'abc']
+        for proposition, proposition_nested, state in zip(flat, nested, states):
+            proposition.State = proposition_nested.State = CODES[state]
+        s1 = connective(*flat)
+        s2 = connective(nested[0], connective(nested[1], nested[2]))
+        assert [node.Value for node in (s1, *flat)] == [node.Value for node in (s2, *nested)]
+
+for connective in (And, Or):
+    absorbing = connective.Absorbing
+    assert all(connective.Table[(TRUE * 3 + code) * 3 + absorbing] == (absorbing, code, absorbing) for code in (FALSE, TRUE, UNDEFINED))
+
+assert And(p, q, True).Verbose and not Or(p, q, False).Verbose and XOr(p, q, r, True).Verbose
+try:
+    And(p, q, 'Undefined')
+except TypeError:
+    pass
+else:
+    raise AssertionError('And accepted a non-proposition operand.')
+
+p = Proposition('rains')
+q = Proposition('home')
+r = Proposition('cafe')
+
+s1 = And(p, q, r)
+s2 = And(p, And(q, r))
+
+summary(p, q, r, s1, s2, info = 'test 12')
+
+# Test 13: Binary decision diagrams against truth tables
+
+from bdd import BDD
+
+def getTruth(statement, row: dict):
+    """Returns the value code a statement takes for the given propositions' codes."""
+    if isinstance(statement, Proposition):
+        return row[statement]
+    return statement.refinement((UNDEFINED,) + tuple(getTruth(operand, row) for operand in statement.getOperands()))[0]
+
+def follow(bdd: BDD, node: int, row: dict):
+    """Returns the terminal a diagram node reaches for the given propositions' codes."""
+    while node > 1:
+        node = bdd.Highs[node] if row[bdd.Propositions[bdd.Levels[node]]] == TRUE else bdd.Lows[node]
+    return node
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+
+propositions = (p, q, r)
+statements = (
+    Or(p, Not(p)),
+    And(p, Not(p)),
+    Implicative(p, And(q, r)),
+    Or(Not(p), And(q, r)),
+    XOr(p, q, r),
+    BiImplicative(Or(p, q), Not(And(Not(p), Not(q)))),
+    And(Or(p, q), Implicative(q, r), Not(r))
+)
+rows = [dict(zip(propositions, codes)) for codes in product((FALSE, TRUE), repeat = 3)]
+
+bdd = BDD(*statements)
+for statement in statements:
+    column = [getTruth(statement, row) for row in rows]
+    assert bdd.isTautology(statement) == all(column)
+    assert bdd.isContradiction(statement) == (not any(column))
+    for other in statements:
+        assert bdd.isEquivalent(statement, other) == (column == [getTruth(other, row) for row in rows])
+    for values in product((True, False, 'Undefined'), repeat = 3):
+        assignment = dict(zip(propositions, values))
+        matching = [row for row in rows if all(value == 'Undefined' or CODES[value] == row[proposition] for proposition, value in assignment.items())]
+        completions = {getTruth(statement, row) for row in matching}
+        assert bdd.evaluate(statement, assignment) == (VALUES[completions.pop()] if len(completions) == 1 else 'Undefined')
+        restricted = bdd.restrict(statement, {proposition.Description: value for proposition, value in assignment.items()})
+        for row in rows:
+            fixed = {proposition: row[proposition] if value == 'Undefined' else CODES[value] for proposition, value in assignment.items()}
+            assert follow(bdd, restricted, row) == getTruth(statement, fixed)
+
+print(f"Tautologies: {[statement for statement in statements if bdd.isTautology(statement)]}")
+print(f"Contradictions: {[statement for statement in statements if bdd.isContradiction(statement)]}\n")
+
+# Test 14: Model counting and enumeration against truth tables
+
+from itertools import islice
+from models import countModels, iterateModels
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+t = Proposition('home')
+
+propositions = (p, q, r, t)
+claims = (
+    (Implicative(p, Or(q, r)),),
+    (Implicative(p, Or(q, r)), Not(And(q, r)), Or(p, t)),
+    (XOr(p, q, r, t), BiImplicative(p, Not(t))),
+    (Yes(p), Not(q), Implicative(p, And(q, r)))
+)
+rows = [dict(zip(propositions, codes)) for codes in product((FALSE, TRUE), repeat = 4)]
+
+for statements in claims:
+    for facts in ({}, {p: True}, {p: False, q: 'Undefined'}, {q: True, r: False}):
+        nodes = traverse(*statements)
+        if any(proposition not in nodes for proposition in facts):
+            continue
+        used = [proposition for proposition in propositions if proposition in nodes]
+        expected = set()
+        for row in rows:
+            if all(value == 'Undefined' or CODES[value] == row[proposition] for proposition, value in facts.items()) and all(getTruth(statement, row) == TRUE for statement in statements):
+                expected.add(tuple(row[proposition] == TRUE for proposition in used))
+        models = [tuple(model[proposition] for proposition in used) for model in iterateModels(*statements, facts = facts)]
+        assert len(models) == len(set(models)) and set(models) == expected
+        assert countModels(*statements, facts = facts) == len(expected)
+
+many = [Proposition(f'option {index}') for index in range(64)]
+first = list(islice(iterateModels(Or(*many)), 3))
+assert len(first) == 3 and all(any(model.values()) for model in first) and len({tuple(model.values()) for model in first}) == 3
+
+print(f"Models: {[countModels(*statements) for statements in claims]}\n")
+
+# Test 15: Stored knowledge bases round trip
+
+import os
+import tempfile
+import storage
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+t = Proposition('home')
+
+kb = KnowledgeBase(Implicative(p, And(q, r)), Or(Not(q), t, r))
+kb.setFact(p, True)
+kb.setFact(t, False)
+kb.propagate()
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'kb.lgkb')
+    storage.dump(kb, path)
+    nodes = traverse(*kb.Statements)
+
+    with storage.KnowledgeBaseFile(path) as stored:
+        assert len(stored) == len(nodes)
+        assert [stored.getRepr(index) for index in stored.getStatements()] == [repr(statement) for statement in kb.Statements]
+        assert [stored.getValue(index) for index in range(len(stored))] == [node.Value for node in nodes]
+        assert stored.getFact(stored.getIndex('rains')) is True and stored.getFact(stored.getIndex('coat')) == 'Undefined'
+        partial = stored.materialize([stored.getStatements()[0]])
+        assert sorted(repr(node) for node in partial.values()) == sorted(repr(node) for node in traverse(kb.Statements[0]))
+
+    loaded = storage.load(path)
+    assert [repr(statement) for statement in loaded.Statements] == [repr(statement) for statement in kb.Statements]
+    assert [node.Value for node in traverse(*loaded.Statements)] == [node.Value for node in nodes]
+    assert {repr(node): value for node, value in loaded.Facts.items()} == {repr(node): value for node, value in kb.Facts.items()}
+    assert loaded.propagate() == kb.isCoherent()
+
+    with open(path, 'rb') as stream:
+        content = stream.read()
+    for name, corrupted in (('truncated', content[:-4]), ('header', content[:8]), ('magic', b'XXXX' + content[4:]), ('empty', b'')):
+        with open(os.path.join(directory, name), 'wb') as stream:
+            stream.write(corrupted)
+        try:
+            storage.load(os.path.join(directory, name))
+        except ValueError as error:
+            print(f"{name}: {str(error).replace(directory, '...')}")
+        else:
+            raise AssertionError(f'A {name} file was loaded.')
+
+summary(loaded.Statements[0].getOperands()[0], *loaded.Statements, info = 'test 15')
+
+# Test 16: DIMACS export and model import
+
+import io
+import cnf
+from sat import Solver
+
+class Pipe(io.StringIO):
+    """Text stream that cannot seek, like a pipe."""
+
+    def seekable(self):
+        return False
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+
+statements = (Implicative(p, And(q, r)), Or(Not(q), r), XOr(p, q, r))
+facts = {p: True, r: 'Undefined'}
+
+outputs = []
+for stream in (io.StringIO(), Pipe()):
+    stream.write('c statements of test 16\n')
+    variables = cnf.write(statements, stream, facts)
+    outputs.append(stream.getvalue())
+assert outputs[0] == outputs[1]
+
+lines = outputs[0].splitlines()[1:]
+_, _, count, size = lines[0].split()
+clauses = [[int(word) for word in line.split()] for line in lines[1:]]
+assert int(count) >= max(variables.values()) and int(size) == len(clauses) and all(clause[-1] == 0 for clause in clauses)
+
+solver = Solver()
+solver.newVariables(int(count))
+for clause in clauses:
+    solver.addClause([2 * abs(literal) + (literal < 0) for literal in clause[:-1]])
+assert solver.solve()
+answer = ['s SATISFIABLE', 'v ' + ' '.join(str(variable if solver.Model[variable] else -variable) for variable in range(1, int(count) + 1)) + ' 0']
+
+model = cnf.readModel(answer)
+assert model == cnf.readModel(['SAT', answer[1][2:]])
+assert cnf.applyModel(model, variables)
+assert all(statement.Value is True for statement in statements) and p.Value is True
+assert all(node.Value is model[variable] for node, variable in variables.items())
+
+assert cnf.readModel(['c no model', 's UNSATISFIABLE']) is None and not cnf.applyModel(None, variables)
+try:
+    cnf.readModel(['s UNKNOWN'])
+except ValueError:
+    pass
+else:
+    raise AssertionError('An undecided answer was read as a model.')
+
+summary(p, q, r, *statements, info = 'test 16')
+
+# Test 17: Evaluation cache against construction
+
+from cache import EvaluationCache
+
+def build(a, b, shared: bool):
+    n = Not(a)
+    return Implicative(And(n, n if shared else Not(a)), XOr(Implicative(b, a), Implicative(b, b)))
+
+def construct(shared: bool, values):
+    a = Proposition('a')
+    b = Proposition('b')
+    a.State, b.State = (CODES[value] for value in values)
+    return build(a, b, shared).Value
+
+cache = EvaluationCache()
+formulas = {shared: build(Proposition('a'), Proposition('b'), shared) for shared in (True, False)}
+for values in product((True, False, 'Undefined'), repeat = 2):
+    for shared, formula in formulas.items():
+        assert cache.evaluate(formula, dict(zip('ab', values))) == construct(shared, values)
+
+print(f"Shared: {cache.evaluate(formulas[True], {'a': False, 'b': True})}, repeated: {cache.evaluate(formulas[False], {'a': False, 'b': True})}\n")
+
+p = Proposition('rains')
+q = Proposition('coat')
+s1 = Implicative(p, q)
+s2 = Or(p, q)
+
+cache = EvaluationCache(size = 2)
+p.setSelfValue(True)
+q.setSelfValue(False)
+assert cache.evaluate(s1) is False
+assert cache.evaluate(s1) is False
+assert cache.getStatistics() == {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'size': 2}
+
+q.setSelfValue(True)
+assert cache.evaluate(s1) is True
+assert cache.evaluate(s1, {'coat': False}) is False and cache.evaluate(s1, {q: False}) is False
+assert cache.getStatistics() == {'hits': 3, 'misses': 2, 'evictions': 0, 'entries': 2, 'size': 2}
+
+assert cache.evaluate(s2) is True
+assert cache.getStatistics()['evictions'] == 1
+assert cache.evaluate(s1, {'coat': False}) is False
+assert cache.evaluate(s1) is True
+assert cache.getStatistics() == {'hits': 4, 'misses': 4, 'evictions': 2, 'entries': 2, 'size': 2}
+
+cache.clear()
+assert cache.getStatistics() == {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0, 'size': 2}
+
+# Test 18: Batch evaluation against construction
+
+from batch import evaluateBatch
+
+def build(p, q, r):
+    shared = Or(q, r)
+    return Implicative(p, shared), And(p, shared, Not(r)), XOr(shared, q)
+
+propositions = [Proposition(name) for name in ('rains', 'coat', 'umbrella')]
+statements = build(*propositions)
+assignments = list(product((FALSE, TRUE, UNDEFINED), repeat = 3))
+nodes, values = evaluateBatch(statements, propositions, assignments)
+
+for codes, row in zip(assignments, values):
+    rebuilt = [Proposition(name) for name in ('rains', 'coat', 'umbrella')]
+    for proposition, code in zip(rebuilt, codes):
+        proposition.State = code
+    assert [node.State for node in traverse(*build(*rebuilt))] == row.tolist()
+
+print(f"Scenarios: {len(values)}, nodes: {nodes}\n")
+
+# Test 19: Truth tables against brute-force evaluation
+
+from truthtable import truthTable, countTrue, writeTable
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+t = Proposition('home')
+
+propositions = [p, q, r, t]
+statements = [Implicative(p, And(q, r)), XOr(p, q, t), BiImplicative(Not(t), Or(q, r, p)), Yes(r)]
+expected = [
+    (values, tuple(getTruth(statement, {proposition: CODES[value] for proposition, value in zip(propositions, values)}) == TRUE for statement in statements))
+    for values in product((False, True), repeat = 4)
+]
+
+for bits in (1, 2, 4, 16):
+    assert list(truthTable(statements, propositions, bits = bits)) == expected
+    assert countTrue(statements, propositions, bits = bits) == [sum(results[index] for _, results in expected) for index in range(len(statements))]
+    stream = io.StringIO()
+    writeTable(statements, stream, propositions, bits = bits)
+    lines = [' | '.join(str(element) for element in propositions + statements)]
+    lines += [' | '.join('T' if value else 'F' for value in values + results) for values, results in expected]
+    assert stream.getvalue() == '\n'.join(lines) + '\n'
+
+print(f"True rows: {countTrue(statements, propositions, bits = 2)}\n")
+
+# Test 20: Parsing formulas from their representation
+
+from formula import Parser, parse
+
+p = Proposition('rains')
+q = Proposition('coat')
+r = Proposition('umbrella')
+
+formulas = [Implicative(p, And(q, r)), Or(Not(q), r, p), XOr(Yes(p), BiImplicative(q, r)), And(p, Not(Not(q)))]
+for formula in formulas:
+    assert repr(parse(repr(formula))) == repr(formula)
+
+parser = Parser()
+s1, s2 = parser.parseAll(['[rains ⟶ [coat ^ umbrella]]', '[[coat ^ umbrella] v rains]'])
+assert s2.Propositions[0] is s1.Propositions[1] and s2.Propositions[1] is s1.Propositions[0]
+assert parser.getProposition('coat') is s1.Propositions[1].Propositions[0]
+
+for text in ('[a ^ b', '[a ^ b v c]', '[a ⟶ b ⟶ c]', '[]'):
+    try:
+        parse(text)
+    except ValueError as error:
+        print(error)
+    else:
+        raise AssertionError(f"'{text}' was parsed.")
+print()
+
+# Test 21: Diagnostics
+
+import contextlib
+
+def build():
+    p = Proposition('rains')
+    q = Proposition('coat')
+    r = Proposition('umbrella')
+    p.setSelfValue(False)
+    q.setSelfValue('Undefined')
+    r.setSelfValue('Undefined')
+    return And(p, q), Or(q, r), Yes(r)
+
+sink = Diagnostics()
+setDiagnostics(sink)
+s1, s2, s3 = build()
+assert [(connective, states) for connective, states in sink.Records] == [(s1, (FALSE, FALSE, UNDEFINED)), (s2, (TRUE, UNDEFINED, UNDEFINED))]
+assert sink.Counts == {'And': 1, 'Or': 1} and sink.getTotal() == 2
+assert sink.getUndefined(sink.Records[0]) == [s1.Propositions[1]]
+
+stream = io.StringIO()
+sink = Diagnostics(stream, batch_size = 3)
+setDiagnostics(sink)
+records = [build()[:2] for _ in range(2)]
+assert len(stream.getvalue().splitlines()) == 3 and len(sink.Records) == 1
+sink.flush()
+assert stream.getvalue() == ''.join(f"{s1.getWarning((FALSE, FALSE, UNDEFINED))}\n{s2.getWarning((TRUE, UNDEFINED, UNDEFINED))}\n" for s1, s2 in records)
+assert sink.Records == [] and sink.Counts == {'And': 2, 'Or': 2}
+
+setDiagnostics(None)
+output = io.StringIO()
+with contextlib.redirect_stdout(output):
+    build()
+assert output.getvalue() == '' and sink.getTotal() == 4
+
+print(f"Warnings: {sink.Counts}\n")
+
+# Test 22: Profiling
+
+profiler = Profiler()
+setProfiler(profiler)
+s1, s2, s3 = build()
+s1.State = UNDEFINED
+s1.evaluate()
+snapshot = profiler.snapshot()
+assert {name: counters['constructions'] for name, counters in snapshot.items()} == {'And': 1, 'Or': 1, 'Yes': 1}
+assert snapshot['And']['evaluations'] == 2 and snapshot['And']['rows'] == {'Special Case 1': 1, 'Special Case 3': 1}
+assert snapshot['Yes']['rows'] == {'Class-Specific Case 1': 1} and snapshot['Yes']['undefined'] == 0
+assert snapshot['And']['undefined'] == 1 and snapshot['Or']['undefined'] == 2
+
+setProfiler(None)
+output = io.StringIO()
+with contextlib.redirect_stdout(output):
+    build()
+assert output.getvalue() == '' and profiler.snapshot() == snapshot
+
+print(f"Profile: { {name: counters['rows'] for name, counters in snapshot.items()} }\n")
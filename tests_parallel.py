@@ -0,0 +1,40 @@
+import json
+
+from parallel import checkStream
+
+# Parallel checking tests:
+#
+# Workers may be spawned processes, which import this module again, so the
+# tests only run under the '__main__' guard.
+
+def getLines(count: int):
+    """Returns claim set lines alternating coherent and incoherent ones, with malformed ones mixed in."""
+    lines = []
+    for index in range(count):
+        record = {'id': index, 'propositions': {'rains': True, 'coat': bool(index % 2)}, 'statements': ['[rains ⟶ [coat ^ umbrella]]']}
+        lines.append(json.dumps(record, ensure_ascii = False) + '\n')
+        if index % 50 == 0:
+            lines += ['\n', '{"id": "broken", "statements": ["[rains ^"]}\n', 'not json\n', '[1, 2]\n']
+    return lines
+
+def main():
+    lines = getLines(500)
+
+    # Test 1: Results come back in input order with several workers
+
+    results = [json.loads(result) for result in checkStream(lines, workers = 3, chunk = 7, backlog = 2)]
+    claims = [result for result in results if 'error' not in result]
+    assert [result['id'] for result in claims] == list(range(500))
+    assert [result['coherent'] for result in claims] == [bool(index % 2) for index in range(500)]
+    assert results == [json.loads(result) for result in checkStream(lines, workers = 1)]
+
+    # Test 2: Malformed lines give error records in place
+
+    errors = [result for result in results if 'error' in result]
+    assert len(errors) == 3 * 10 and len(results) == 500 + len(errors)
+    assert [result['id'] for result in errors[:3]] == ['broken', None, None]
+    assert results[1:4] == errors[:3] and results[4]['id'] == 1
+    print(f"Results: {len(results)}, errors: {len(errors)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import asyncio
+
+from service import Service, query
+
+# Service tests:
+#
+# Workers are spawned processes, which import this module again, so the tests
+# only run under the '__main__' guard.
+
+def getRecords(count: int, prefix: str):
+    """Returns claim sets alternating coherent and incoherent ones."""
+    return [
+        {'id': f'{prefix} {index}', 'propositions': {'rains': True, 'coat': bool(index % 2)}, 'statements': ['[rains ⟶ [coat ^ umbrella]]']}
+        for index in range(count)
+    ]
+
+async def main():
+    service = Service(workers = 2, batch_size = 16, window = 0.01, queue_size = 8, pipeline = 4)
+    host, port = await service.start()
+
+    # Test 1: Ordering and batching over concurrent connections
+
+    clients = [getRecords(100, f'client {client}') for client in range(4)]
+    queued = []
+
+    async def monitor():
+        while True:
+            queued.append(service.Queue.qsize())
+            await asyncio.sleep(0)
+
+    sampler = asyncio.create_task(monitor())
+    responses = await asyncio.gather(*[query(records, host, port) for records in clients])
+    sampler.cancel()
+
+    for records, results in zip(clients, responses):
+        assert [result['id'] for result in results] == [record['id'] for record in records]
+        assert [result['coherent'] for result in results] == [record['propositions']['coat'] for record in records]
+
+    # Test 2: Backpressure held the queue at its size while every claim set was answered
+
+    assert max(queued) == service.QueueSize
+
+    # Test 3: Errors and metrics
+
+    results = await query(['not a claim set', {'id': 'broken', 'statements': ['[rains ^']}], host, port)
+    assert 'error' in results[0] and results[1]['id'] == 'broken' and 'error' in results[1]
+    metrics = (await query([{'metrics': True}], host, port))[0]
+    assert metrics['requests'] == metrics['responses'] == 402 and metrics['errors'] == 2
+    assert metrics['batches'] < metrics['requests'] and metrics['batch_size'] > 1
+    assert metrics['latency']['p50'] is not None and metrics['queued'] == 0
+    print(f"Metrics: {metrics}")
+
+    # Test 4: Stopping closes idle connections and cancels batches in flight without blocking the loop
+
+    idle = await asyncio.open_connection(host, port)
+    pending = asyncio.create_task(query(getRecords(50, 'late'), host, port))
+    while not service.Tasks:
+        await asyncio.sleep(0.001)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.wait_for(service.stop(), 10)
+    ticker.cancel()
+    assert not service.Tasks and not service.Connections and service.Executor is None
+    assert await asyncio.wait_for(idle[0].read(), 5) == b''
+    idle[1].close()
+    await asyncio.wait_for(asyncio.gather(pending, return_exceptions = True), 5)
+    print(f"Stopped with {ticks} ticks of the event loop meanwhile")
+
+if __name__ == '__main__':
+    asyncio.run(main())
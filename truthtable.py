@@ -0,0 +1,127 @@
+from functools import reduce
+from itertools import product
+from operator import and_, or_, xor
+
+from main import *
+
+# Bitwise operations:
+
+OPERATIONS = {
+    Yes:            lambda mask, a: a,
+    Not:            lambda mask, a: ~a & mask,
+    And:            lambda mask, *words: reduce(and_, words),
+    Or:             lambda mask, *words: reduce(or_, words),
+    XOr:            lambda mask, *words: reduce(xor, words),
+    Implicative:    lambda mask, a, b: ~a & mask | b,
+    BiImplicative:  lambda mask, a, b: ~(a ^ b) & mask
+}
+
+def getOperation(connective_class):
+    """Returns the bitwise operation of a connective class.
+
+    Classes without a dedicated operation get one built from the minterms of
+    the two-valued function their lookup table implies.
+    """
+    operation = OPERATIONS.get(connective_class)
+    if operation is not None:
+        return operation
+    arity = 1 if issubclass(connective_class, UnaryConnective) else 2
+    minterms = [
+        operands for operands in product((FALSE, TRUE), repeat = arity)
+        if connective_class.Table[encodeState((VALUES[UNDEFINED], tuple(VALUES[code] for code in operands)))][0] == TRUE
+    ]
+    def operation(mask, *words):
+        result = 0
+        for operands in minterms:
+            term = mask
+            for word, code in zip(words, operands):
+                term &= word if code == TRUE else ~word
+            result |= term
+        return result
+    OPERATIONS[connective_class] = operation
+    return operation
+
+def getPattern(bit: int, width: int):
+    """Returns the word in which row j of a block has the given bit of j."""
+    span = 1 << bit
+    word = ((1 << span) - 1) << span
+    size = span << 1
+    while size < width:
+        word |= word << size
+        size <<= 1
+    return word & ((1 << width) - 1)
+
+# Truth table generation:
+
+def iterateBlocks(statements, propositions = None, bits: int = 16):
+    """Evaluates the statements over every assignment, a block of rows at a time.
+
+    Rows are numbered in binary, the first proposition being the most
+    significant bit and 1 meaning True, so that row 0 assigns False to every
+    proposition. Each block holds up to 2 ** bits consecutive rows packed into
+    Python ints, bit j standing for the block's j-th row, and every node of
+    the graph is evaluated once per block with bitwise operations.
+
+    Yields the first row of each block, its number of rows and the word of each
+    statement.
+    """
+    nodes = traverse(*statements)
+    if propositions is None:
+        propositions = [node for node in nodes if isinstance(node, Proposition)]
+    count = len(propositions)
+    bits = min(bits, count)
+    width = 1 << bits
+    mask = (1 << width) - 1
+    patterns = [getPattern(bit, width) for bit in range(bits)]
+    position = {proposition: count - 1 - index for index, proposition in enumerate(propositions)}
+    connectives = [(node, getOperation(type(node)), node.getOperands()) for node in nodes if not isinstance(node, Proposition)]
+
+    for block in range(1 << (count - bits)):
+        words = {}
+        for proposition, bit in position.items():
+            if bit < bits:
+                words[proposition] = patterns[bit]
+            else:
+                words[proposition] = mask if block >> (bit - bits) & 1 else 0
+        for node in nodes:
+            if isinstance(node, Proposition) and node not in words:
+                words[node] = 0
+        for node, operation, operands in connectives:
+            words[node] = operation(mask, *[words[operand] for operand in operands])
+        yield block << bits, width, [words[statement] for statement in statements]
+
+def truthTable(statements, propositions = None, bits: int = 16):
+    """Lazily yields the truth table rows of the given statements.
+
+    Each row is a pair of tuples: the propositions' values and the statements'
+    values. Propositions default to those of the graph, in construction order,
+    and any other proposition of the graph is taken as False. Rows are only
+    unpacked from their block when requested, so tables far larger than the
+    available memory can be streamed.
+    """
+    if propositions is None:
+        propositions = [node for node in traverse(*statements) if isinstance(node, Proposition)]
+    count = len(propositions)
+    for first, size, words in iterateBlocks(statements, propositions, bits):
+        for offset in range(size):
+            row = first + offset
+            yield (
+                tuple(bool(row >> (count - 1 - index) & 1) for index in range(count)),
+                tuple(bool(word >> offset & 1) for word in words)
+            )
+
+def countTrue(statements, propositions = None, bits: int = 16):
+    """Returns the number of rows in which each statement is True."""
+    counts = [0] * len(statements)
+    for first, size, words in iterateBlocks(statements, propositions, bits):
+        for index, word in enumerate(words):
+            counts[index] += word.bit_count()
+    return counts
+
+def writeTable(statements, stream, propositions = None, bits: int = 16):
+    """Writes the truth table of the given statements to a text stream."""
+    if propositions is None:
+        propositions = [node for node in traverse(*statements) if isinstance(node, Proposition)]
+    stream.write(' | '.join(str(element) for element in list(propositions) + list(statements)) + '\n')
+    for values, results in truthTable(statements, propositions, bits):
+        stream.write(' | '.join('T' if value else 'F' for value in values + results) + '\n')